@@ -3,6 +3,8 @@ from __future__ import annotations
 from sys import getsizeof
 import re
 from typing import Iterable, Union, Optional, Any
+from collections import OrderedDict
+from weakref import WeakValueDictionary
 import amulet_nbt
 
 if amulet_nbt.__major__ >= 4:
@@ -95,6 +97,8 @@ class Block:
         "_blockstate",
         "_snbt_blockstate",
         "_full_blockstate",
+        "_hash",
+        "__weakref__",
     )  # Reduces memory footprint
 
     snbt_blockstate_regex = re.compile(
@@ -126,6 +130,7 @@ class Block:
         self._blockstate: Optional[str] = None
         self._snbt_blockstate: Optional[str] = None
         self._full_blockstate: Optional[str] = None
+        self._hash: Optional[int] = None
 
         if properties is None:
             properties = {}
@@ -154,6 +159,12 @@ class Block:
         )
         return cls(namespace, block_name, properties)
 
+    @classmethod
+    def intern(cls, block: Block) -> Block:
+        """Get the canonical instance of a block state from the default :class:`BlockRegistry`.
+        Equal blocks passed to this return the same object while it is in use."""
+        return DefaultBlockRegistry.intern(block)
+
     @property
     def namespaced_name(self) -> str:
         """
@@ -342,11 +353,13 @@ class Block:
         """
         if not isinstance(other, Block):
             return NotImplemented
+        if self is other:
+            return True
 
         return (
-            self.namespaced_name == other.namespaced_name
-            and self.properties == other.properties
-            and self.extra_blocks == other.extra_blocks
+            self._namespaced_name == other._namespaced_name
+            and self._properties == other._properties
+            and self._extra_blocks == other._extra_blocks
         )
 
     def __gt__(self, other: Block) -> bool:
@@ -363,7 +376,22 @@ class Block:
 
         :return: A hash of the Block object
         """
-        return hash(self.full_blockstate)
+        if self._hash is None:
+            self._hash = hash(_block_key(self))
+        return self._hash
+
+    def __getstate__(self) -> tuple[None, dict[str, Any]]:
+        # The hash of a str is different in each process so the cached hash is not pickled.
+        return None, {
+            slot: getattr(self, slot)
+            for slot in Block.__slots__
+            if slot not in ("_hash", "__weakref__")
+        }
+
+    def __setstate__(self, state: tuple[None, dict[str, Any]]) -> None:
+        for slot, value in state[1].items():
+            setattr(self, slot, value)
+        self._hash = None
 
     def __add__(self, other: Block) -> Block:
         """
@@ -489,6 +517,103 @@ class Block:
         )
 
 
+def _block_key(block: Block) -> tuple:
+    """A tuple that is equal for equal blocks.
+    This only uses the public api so that it also works with the amulet-core Block class.
+    """
+    return (
+        block.namespaced_name,
+        tuple(
+            sorted(
+                (key, value.__class__, value.py_data)
+                for key, value in block.properties.items()
+            )
+        ),
+        block.extra_blocks,
+    )
+
+
+class BlockRegistry:
+    """
+    Interns block states so that equal blocks share one instance.
+
+    The canonical instances are stored with weak references so they are freed when nothing else uses them.
+    The most recently used blocks and parsed blockstate strings are also kept alive, up to a maximum number.
+    Blocks of any class with the same api as :class:`Block` can be interned. Eg. the amulet-core Block class
+    which :class:`minecraft_model_reader.api.Block` is when amulet-core is installed.
+
+    >>> registry = BlockRegistry()
+    >>> registry.from_string_blockstate("minecraft:oak_log[axis=x]") is registry.intern(Block.from_string_blockstate("minecraft:oak_log[axis=x]"))
+    True
+    """
+
+    def __init__(
+        self, max_recent: int = 4096, block_class: Optional[type[Block]] = None
+    ):
+        """
+        :param max_recent: The maximum number of recently used blocks and blockstate strings to keep alive.
+        :param block_class: The class used to create blocks from blockstate strings. Defaults to :class:`Block`.
+        """
+        if max_recent < 0:
+            raise ValueError("max_recent must be 0 or more")
+        self._max_recent = max_recent
+        self._block_class: type[Block] = Block if block_class is None else block_class
+        self._blocks: WeakValueDictionary[tuple, Block] = WeakValueDictionary()
+        # recently used blocks and blockstate strings. The key is (block key,) or (snbt, blockstate)
+        self._recent: OrderedDict[tuple, Block] = OrderedDict()
+
+    def __len__(self) -> int:
+        """The number of canonical blocks currently alive."""
+        return len(self._blocks)
+
+    def _use(self, key: tuple, block: Block) -> None:
+        if self._max_recent:
+            self._recent[key] = block
+            self._recent.move_to_end(key)
+            if len(self._recent) > self._max_recent:
+                self._recent.popitem(last=False)
+
+    def intern(self, block: Block) -> Block:
+        """Get the canonical instance of a block state.
+
+        :param block: The block to intern. This becomes the canonical instance if there is not one already.
+        :return: The canonical block equal to block.
+        """
+        key = _block_key(block)
+        canonical = self._blocks.get(key)
+        if canonical is None:
+            canonical = self._blocks[key] = block
+        self._use((key,), canonical)
+        return canonical
+
+    def _from_blockstate(self, blockstate: str, snbt: bool) -> Block:
+        key = (snbt, blockstate)
+        block = self._recent.get(key)
+        if block is None:
+            if snbt:
+                block = self._block_class.from_snbt_blockstate(blockstate)
+            else:
+                block = self._block_class.from_string_blockstate(blockstate)
+            block = self.intern(block)
+        self._use(key, block)
+        return block
+
+    def from_string_blockstate(self, blockstate: str) -> Block:
+        """Get the canonical instance of a Java format blockstate. See :meth:`Block.from_string_blockstate`"""
+        return self._from_blockstate(blockstate, False)
+
+    def from_snbt_blockstate(self, blockstate: str) -> Block:
+        """Get the canonical instance of a blockstate with SNBT values. See :meth:`Block.from_snbt_blockstate`"""
+        return self._from_blockstate(blockstate, True)
+
+    def clear(self) -> None:
+        """Forget all canonical instances."""
+        self._blocks.clear()
+        self._recent.clear()
+
+
+DefaultBlockRegistry = BlockRegistry()
+
 # some blocks that probably will not change. Keeping these in one place will make them easier to change if they do.
 UniversalAirBlock = Block("universal_minecraft", "air")
 # do not rely on this staying the same.
@@ -0,0 +1,240 @@
+from typing import IO, BinaryIO, TextIO, Optional, Literal, overload
+from collections.abc import Iterator
+import os
+import io
+import stat
+import threading
+import zipfile
+
+"""
+Resource packs can be read directly from zip files (.zip, .jar and .mcpack) without extracting them.
+The files in an archive are given paths as if the archive were a directory (Eg. `pack.zip/assets/minecraft/...`).
+The functions in this module accept both real paths and paths within archives.
+The central directory of each archive is read once and shared by everything reading from that archive.
+"""
+
+ArchiveExtensions = (".zip", ".jar", ".mcpack")
+
+
+class ZipIndex:
+    """An index of the files in a zip archive."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._mtime = os.stat(path).st_mtime
+        self._zip = zipfile.ZipFile(path)
+        self._files = {
+            info.filename: info for info in self._zip.infolist() if not info.is_dir()
+        }
+
+    @property
+    def path(self) -> str:
+        """The path of the archive."""
+        return self._path
+
+    @property
+    def mtime(self) -> float:
+        """The modification time of the archive when it was indexed."""
+        return self._mtime
+
+    def names(self) -> Iterator[str]:
+        """The names of all files in the archive. Directories are separated by /"""
+        return iter(self._files)
+
+    def isfile(self, name: str) -> bool:
+        return name in self._files
+
+    def read(self, name: str) -> bytes:
+        """Read the data of a file in the archive."""
+        return self._zip.read(self._files[name])
+
+    def find_root(self, marker: str) -> Optional[str]:
+        """Find the directory containing a file.
+        Only the root of the archive and directories directly in the root are checked.
+
+        :param marker: The name of the file to find. Eg. pack.mcmeta
+        :return: The directory ending in / or an empty string for the root. None if the file was not found.
+        """
+        if marker in self._files:
+            return ""
+        for name in self._files:
+            root, _, file_name = name.rpartition("/")
+            if file_name == marker and root and "/" not in root:
+                return f"{root}/"
+        return None
+
+    def close(self) -> None:
+        """Close the zip file. Use :func:`close_archive` to close a shared index."""
+        self._zip.close()
+
+
+_lock = threading.Lock()
+_indexes: dict[str, ZipIndex] = {}
+
+
+def _reset_after_fork() -> None:
+    """Forget the indexes inherited from the parent process.
+    A forked process shares the file offset of the parent's open zip files
+    so reading them from both processes would mix up the data."""
+    global _lock
+    _lock = threading.Lock()
+    _indexes.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def is_archive(path: str) -> bool:
+    """Is the path a zip file that can be read as a resource pack."""
+    return (
+        path.lower().endswith(ArchiveExtensions)
+        and os.path.isfile(path)
+        and zipfile.is_zipfile(path)
+    )
+
+
+def get_zip_index(path: str) -> ZipIndex:
+    """Get the shared index of a zip file. The file is indexed again if it has been modified."""
+    path = os.path.normpath(os.path.abspath(path))
+    with _lock:
+        index = _indexes.get(path)
+        if index is None or index.mtime != os.stat(path).st_mtime:
+            if index is not None:
+                index.close()
+            index = _indexes[path] = ZipIndex(path)
+        return index
+
+
+def close_archive(path: str) -> None:
+    """Close the shared index of a zip file if it has one.
+    The file is indexed again the next time it is read."""
+    path = os.path.normpath(os.path.abspath(path))
+    with _lock:
+        index = _indexes.pop(path, None)
+    if index is not None:
+        index.close()
+
+
+def _find_indexed_archive_file(path: str) -> Optional[tuple[ZipIndex, str]]:
+    """Find the archive containing a path and the name of the file within it.
+    Only archives already indexed by this process are checked so the file system is not accessed.
+    """
+    path = os.path.normpath(os.path.abspath(path))
+    for archive_path, index in list(_indexes.items()):
+        if (
+            path.startswith(archive_path)
+            and path[len(archive_path) : len(archive_path) + 1] == os.sep
+        ):
+            return index, path[len(archive_path) + 1 :].replace(os.sep, "/")
+    return None
+
+
+def _find_archive_file(path: str) -> Optional[tuple[ZipIndex, str]]:
+    """Find the archive containing a path and the name of the file within it.
+    Archives not indexed by this process yet (Eg. in a worker process) are found by walking up the path
+    so this should only be used once the path has been found not to exist on the file system.
+    """
+    archive_file = _find_indexed_archive_file(path)
+    if archive_file is not None:
+        return archive_file
+    path = os.path.normpath(os.path.abspath(path))
+    child, parent = path, os.path.dirname(path)
+    while parent != child:
+        try:
+            parent_stat = os.stat(parent)
+        except (FileNotFoundError, NotADirectoryError):
+            child, parent = parent, os.path.dirname(parent)
+            continue
+        except OSError:
+            return None
+        # The first parent that exists is either the archive or a directory
+        if stat.S_ISREG(parent_stat.st_mode) and is_archive(parent):
+            return get_zip_index(parent), os.path.relpath(path, parent).replace(
+                os.sep, "/"
+            )
+        return None
+    return None
+
+
+def in_archive(path: str) -> bool:
+    """Is the path an archive or a path within an archive."""
+    return is_archive(path) or (
+        not os.path.exists(path) and _find_archive_file(path) is not None
+    )
+
+
+def iter_archive_files(root_dir: str) -> Iterator[str]:
+    """Get the paths of all files within an archive directory.
+
+    :param root_dir: The path of an archive or a directory within an archive.
+    :return: The paths of the files in root_dir and its subdirectories.
+    """
+    if is_archive(root_dir):
+        index, prefix = get_zip_index(root_dir), ""
+    else:
+        archive_file = _find_archive_file(root_dir)
+        if archive_file is None:
+            return
+        index, prefix = archive_file
+        prefix = f"{prefix}/"
+    for name in index.names():
+        if name.startswith(prefix):
+            yield os.path.join(index.path, *name.split("/"))
+
+
+def resource_isfile(path: str) -> bool:
+    """Does the path point to a file. The path may be within an archive."""
+    archive_file = _find_indexed_archive_file(path)
+    if archive_file is None:
+        if os.path.isfile(path):
+            return True
+        archive_file = _find_archive_file(path)
+    return archive_file is not None and archive_file[0].isfile(archive_file[1])
+
+
+def resource_mtime(path: str) -> float:
+    """The modification time of a file. Files within an archive use the time of the archive."""
+    archive_file = _find_indexed_archive_file(path)
+    if archive_file is None:
+        try:
+            return os.stat(path).st_mtime
+        except (FileNotFoundError, NotADirectoryError):
+            archive_file = _find_archive_file(path)
+            if archive_file is None:
+                raise
+    return archive_file[0].mtime
+
+
+@overload
+def open_resource(path: str, mode: Literal["rb"] = "rb") -> BinaryIO: ...
+
+
+@overload
+def open_resource(path: str, mode: Literal["r"]) -> TextIO: ...
+
+
+def open_resource(path: str, mode: str = "rb") -> IO:
+    """Open a file for reading. The path may be within an archive.
+
+    :param path: The path to open.
+    :param mode: "rb" to open in binary mode or "r" to open in text mode.
+    """
+    if mode not in ("r", "rb"):
+        raise ValueError(f"Invalid mode {mode}")
+    archive_file = _find_indexed_archive_file(path)
+    if archive_file is None:
+        try:
+            return open(path, mode)
+        except (FileNotFoundError, NotADirectoryError):
+            archive_file = _find_archive_file(path)
+            if archive_file is None:
+                raise
+    index, name = archive_file
+    try:
+        data = index.read(name)
+    except KeyError:
+        raise FileNotFoundError(path) from None
+    if mode == "r":
+        return io.StringIO(data.decode("utf-8"))
+    return io.BytesIO(data)
@@ -0,0 +1,42 @@
+from typing import cast
+from enum import IntEnum
+from PIL import Image
+import numpy
+
+from minecraft_model_reader.api.archive import open_resource
+
+
+class TextureTransparency(IntEnum):
+    Opaque = 0  # all pixels are fully opaque
+    Cutout = 1  # all pixels are either fully opaque or fully transparent
+    Translucent = 2  # at least one pixel is partially transparent
+
+
+def get_image_transparency(im: Image.Image) -> TextureTransparency:
+    """Find the transparency of an image from its alpha band."""
+    if "A" in im.getbands():
+        alpha = im.getchannel("A")
+    elif "transparency" in im.info:
+        alpha = im.convert("RGBA").getchannel("A")
+    else:
+        return TextureTransparency.Opaque
+
+    # a single band image gives the extrema as two ints
+    low, high = cast(tuple[int, int], alpha.getextrema())
+    if low == 255:
+        return TextureTransparency.Opaque
+    elif 0 < low or 0 < high < 255:
+        # there is at least one pixel between fully transparent and fully opaque
+        return TextureTransparency.Translucent
+
+    # read the band directly into a uint8 array to check the values in between
+    data = numpy.frombuffer(alpha.tobytes(), numpy.uint8)
+    if numpy.any((data != 0) & (data != 255)):
+        return TextureTransparency.Translucent
+    return TextureTransparency.Cutout
+
+
+def get_texture_transparency(texture_path: str) -> TextureTransparency:
+    """Find the transparency of the image at the given path. The path may be within an archive."""
+    with open_resource(texture_path) as f, Image.open(f) as im:
+        return get_image_transparency(im)
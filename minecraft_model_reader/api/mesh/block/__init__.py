@@ -1 +1 @@
-from .block_mesh import BlockMesh
+from .block_mesh import BlockMesh, PackedBlockMesh
@@ -1,13 +1,43 @@
 from __future__ import annotations
-from typing import Optional, Any
+from typing import Optional, Any, Union, NamedTuple
 from collections.abc import Iterable
+import struct
+import hashlib
 import numpy
 import itertools
 from enum import IntEnum
 
-from minecraft_model_reader.api.mesh.util import rotate_3d
+from minecraft_model_reader.api.mesh.util import rotation_matrix_3d
 
 FACE_KEYS = {"down", "up", "north", "east", "south", "west", None}
+# A fixed order for the face keys used when the mesh is stored in a flat format.
+FACE_KEY_ORDER: tuple[Optional[str], ...] = (
+    None,
+    "down",
+    "up",
+    "north",
+    "east",
+    "south",
+    "west",
+)
+
+# The binary format
+# header: magic, format version, face width, transparency, cull direction bit mask,
+#   texture count, size of the texture table in bytes
+# texture table: the utf-8 texture paths separated by null bytes
+# Then for each cull direction in the bit mask (in FACE_KEY_ORDER):
+#   section header: dtype and length of verts, texture coords, tint verts, faces and texture index
+#   the data of the five arrays in that order
+# Everything after the header is padded to a multiple of 8 bytes.
+_BinaryMagic = b"BMSH"
+_BinaryVersion = 1
+_BinaryHeader = struct.Struct("<4sBBBBII")
+_BinaryArrayHeader = struct.Struct("<3sxI")
+_BinaryAlignment = 8
+
+
+def _pad(size: int) -> int:
+    return -size % _BinaryAlignment
 
 
 def _create_cull_map() -> dict[tuple[int, int], dict[Optional[str], Optional[str]]]:
@@ -34,6 +64,43 @@ def _create_cull_map() -> dict[tuple[int, int], dict[Optional[str], Optional[str
 cull_remap_all = _create_cull_map()
 
 
+def _create_rotation_matrices() -> dict[tuple[int, int], numpy.ndarray]:
+    """Create the combined rotation matrix for each (roty, rotx) in cull_remap_all.
+    Rotations are multiples of 90 degrees so the matrices are exact integer matrices."""
+    rotation_matrices = {}
+    for roty, rotx in cull_remap_all:
+        rotation_matrix = numpy.matmul(
+            rotation_matrix_3d(numpy.array([rotx * 90, 0, 0], float)),
+            rotation_matrix_3d(numpy.array([0, roty * 90, 0], float)),
+        )
+        rotation_matrices[(roty, rotx)] = numpy.rint(rotation_matrix).astype(numpy.int8)
+    return rotation_matrices
+
+
+rotation_matrices_all = _create_rotation_matrices()
+
+
+# The number of values per vertex in the packed vertex buffer.
+# x, y, z, texture x, texture y, tint r, tint g, tint b
+PackedVertexWidth = 8
+
+
+class PackedBlockMesh(NamedTuple):
+    """The data of a BlockMesh packed into contiguous buffers.
+    The data for each cull direction is stored in FACE_KEY_ORDER."""
+
+    # A flat array with PackedVertexWidth values per vertex.
+    vertices: numpy.ndarray
+    # A flat uint32 array of face_mode vertex indexes per face. These index into the whole vertex buffer.
+    faces: numpy.ndarray
+    # A uint32 array with one texture index per face.
+    texture_index: numpy.ndarray
+    # A (7, 2) uint32 array of the start and stop vertex for each cull direction.
+    vert_offsets: numpy.ndarray
+    # A (7, 2) uint32 array of the start and stop face for each cull direction.
+    face_offsets: numpy.ndarray
+
+
 class Transparency(IntEnum):
     FullOpaque = 0  # the block is a full block with opaque textures
     FullTranslucent = (
@@ -47,81 +114,98 @@ class BlockMesh:
 
     @classmethod
     def merge(cls, models: Iterable[BlockMesh]) -> BlockMesh:
-        textures_src: list[str] = []
-        texture_count = 0
-        vert_count: dict[Optional[str], int] = {side: 0 for side in FACE_KEYS}
-        verts_src: dict[Optional[str], list[numpy.ndarray]] = {
-            side: [] for side in FACE_KEYS
-        }
-        tverts_src: dict[Optional[str], list[numpy.ndarray]] = {
-            side: [] for side in FACE_KEYS
-        }
-        tint_verts_src: dict[Optional[str], list[numpy.ndarray]] = {
-            side: [] for side in FACE_KEYS
-        }
-        faces_src: dict[Optional[str], list[numpy.ndarray]] = {
-            side: [] for side in FACE_KEYS
-        }
-        texture_indexes_src: dict[Optional[str], list[numpy.ndarray]] = {
-            side: [] for side in FACE_KEYS
-        }
+        models = list(models)
         transparent: Transparency = Transparency.Partial
 
+        # First pass. Find the size and data type of the output arrays and the new texture indexes.
+        texture_dict: dict[str, int] = {}
+        texture_maps: list[numpy.ndarray] = []
+        vert_count: dict[Optional[str], int] = {}
+        face_count: dict[Optional[str], int] = {}
+        dtypes: dict[Optional[str], tuple[numpy.dtype, ...]] = {}
         cull_dir: Optional[str]
         for temp_model in models:
+            texture_maps.append(
+                numpy.array(
+                    [
+                        texture_dict.setdefault(texture, len(texture_dict))
+                        for texture in temp_model.textures
+                    ],
+                    dtype=numpy.uint32,
+                )
+            )
             for cull_dir in temp_model.faces.keys():
-                verts_src[cull_dir].append(temp_model.verts[cull_dir])
-                tverts_src[cull_dir].append(temp_model.texture_coords[cull_dir])
-                tint_verts_src[cull_dir].append(temp_model.tint_verts[cull_dir])
-                face_table = temp_model.faces[cull_dir].copy()
-                texture_index = temp_model.texture_index[cull_dir].copy()
-                face_table += vert_count[cull_dir]
-                texture_index += texture_count
-                faces_src[cull_dir].append(face_table)
-                texture_indexes_src[cull_dir].append(texture_index)
-
-                vert_count[cull_dir] += int(
-                    temp_model.verts[cull_dir].shape[0] / temp_model.face_mode
+                vert_count[cull_dir] = (
+                    vert_count.get(cull_dir, 0) + temp_model.verts[cull_dir].size // 3
+                )
+                face_count[cull_dir] = (
+                    face_count.get(cull_dir, 0)
+                    + temp_model.texture_index[cull_dir].size
+                )
+                model_dtypes = (
+                    temp_model.verts[cull_dir].dtype,
+                    temp_model.texture_coords[cull_dir].dtype,
+                    temp_model.tint_verts[cull_dir].dtype,
+                    temp_model.faces[cull_dir].dtype,
+                )
+                dtypes[cull_dir] = tuple(
+                    numpy.promote_types(a, b)
+                    for a, b in zip(dtypes.get(cull_dir, model_dtypes), model_dtypes)
                 )
-
-            textures_src += temp_model.textures
-            texture_count += len(temp_model.textures)
             transparent = min(transparent, temp_model.is_transparent)
 
-        if textures_src:
-            textures_, texture_index_map = numpy.unique(
-                textures_src, return_inverse=True, axis=0
-            )
-            textures = tuple(textures_)
-            texture_index_map = texture_index_map.astype(numpy.uint32)
-        else:
-            textures = ()
-            texture_index_map = numpy.array([], dtype=numpy.uint8)
+        textures = tuple(texture_dict)
 
+        # Allocate each output array once.
         verts: dict[Optional[str], numpy.ndarray] = {}
         tverts: dict[Optional[str], numpy.ndarray] = {}
         tint_verts: dict[Optional[str], numpy.ndarray] = {}
         faces: dict[Optional[str], numpy.ndarray] = {}
         texture_indexes: dict[Optional[str], numpy.ndarray] = {}
+        for cull_dir, (
+            vert_dtype,
+            tvert_dtype,
+            tint_dtype,
+            face_dtype,
+        ) in dtypes.items():
+            verts[cull_dir] = numpy.empty(vert_count[cull_dir] * 3, vert_dtype)
+            tverts[cull_dir] = numpy.empty(vert_count[cull_dir] * 2, tvert_dtype)
+            tint_verts[cull_dir] = numpy.empty(vert_count[cull_dir] * 3, tint_dtype)
+            faces[cull_dir] = numpy.empty(
+                face_count[cull_dir] * 3, numpy.promote_types(face_dtype, numpy.uint32)
+            )
+            texture_indexes[cull_dir] = numpy.empty(face_count[cull_dir], numpy.uint32)
 
-        for cull_dir in FACE_KEYS:
-            if faces_src[cull_dir]:
-                faces[cull_dir] = numpy.concatenate(faces_src[cull_dir], axis=None)
-                texture_indexes[cull_dir] = texture_index_map[
-                    numpy.concatenate(texture_indexes_src[cull_dir], axis=None)
+        # Second pass. Copy each model into its slice of the output arrays.
+        vert_offset: dict[Optional[str], int] = dict.fromkeys(dtypes, 0)
+        face_offset: dict[Optional[str], int] = dict.fromkeys(dtypes, 0)
+        for temp_model, texture_map in zip(models, texture_maps):
+            for cull_dir in temp_model.faces.keys():
+                vert_start = vert_offset[cull_dir]
+                vert_end = vert_start + temp_model.verts[cull_dir].size // 3
+                verts[cull_dir][vert_start * 3 : vert_end * 3] = temp_model.verts[
+                    cull_dir
                 ]
-                if verts_src[cull_dir]:
-                    verts[cull_dir] = numpy.concatenate(verts_src[cull_dir], axis=None)
-                    tverts[cull_dir] = numpy.concatenate(
-                        tverts_src[cull_dir], axis=None
-                    )
-                    tint_verts[cull_dir] = numpy.concatenate(
-                        tint_verts_src[cull_dir], axis=None
-                    )
-                else:
-                    verts[cull_dir] = numpy.zeros((0, 3), float)
-                    tverts[cull_dir] = numpy.zeros((0, 2), float)
-                    tint_verts[cull_dir] = numpy.zeros(0, float)
+                tverts[cull_dir][vert_start * 2 : vert_end * 2] = (
+                    temp_model.texture_coords[cull_dir]
+                )
+                tint_verts[cull_dir][vert_start * 3 : vert_end * 3] = (
+                    temp_model.tint_verts[cull_dir]
+                )
+                vert_offset[cull_dir] = vert_end
+
+                face_start = face_offset[cull_dir]
+                face_end = face_start + temp_model.texture_index[cull_dir].size
+                numpy.add(
+                    temp_model.faces[cull_dir],
+                    vert_start,
+                    out=faces[cull_dir][face_start * 3 : face_end * 3],
+                    casting="unsafe",
+                )
+                texture_indexes[cull_dir][face_start:face_end] = texture_map[
+                    temp_model.texture_index[cull_dir]
+                ]
+                face_offset[cull_dir] = face_end
 
         return cls(
             3, verts, tverts, tint_verts, faces, texture_indexes, textures, transparent
@@ -208,6 +292,8 @@ class BlockMesh:
         self._texture_coords = texture_coords
         self._tint_verts = tint_verts
         self._vert_tables: Optional[dict[Optional[str], numpy.ndarray]] = None
+        self._packed: Optional[PackedBlockMesh] = None
+        self._content_hash: Optional[bytes] = None
 
         self._faces = faces
         self._texture_index = texture_index
@@ -217,6 +303,7 @@ class BlockMesh:
         for array in itertools.chain(
             self._verts.values(),
             self._texture_coords.values(),
+            self._tint_verts.values(),
             self._faces.values(),
             self._texture_index.values(),
         ):
@@ -245,6 +332,73 @@ class BlockMesh:
                 array.setflags(write=False)
         return self._vert_tables
 
+    @property
+    def packed(self) -> PackedBlockMesh:
+        """The mesh data packed into one interleaved vertex buffer and one face buffer.
+        The faces with a given cull direction can be found by slicing with the offset table
+        for that direction's index in FACE_KEY_ORDER."""
+        if self._packed is None:
+            vert_counts = numpy.array(
+                [
+                    self._verts[key].size // 3 if key in self._faces else 0
+                    for key in FACE_KEY_ORDER
+                ],
+                numpy.uint32,
+            )
+            face_counts = numpy.array(
+                [
+                    self._texture_index[key].size if key in self._faces else 0
+                    for key in FACE_KEY_ORDER
+                ],
+                numpy.uint32,
+            )
+            vert_stops = numpy.cumsum(vert_counts, dtype=numpy.uint32)
+            face_stops = numpy.cumsum(face_counts, dtype=numpy.uint32)
+            vert_offsets = numpy.stack([vert_stops - vert_counts, vert_stops], 1)
+            face_offsets = numpy.stack([face_stops - face_counts, face_stops], 1)
+
+            keys = [key for key in FACE_KEY_ORDER if key in self._faces]
+            vertices = numpy.empty(
+                (int(vert_stops[-1]), PackedVertexWidth),
+                numpy.result_type(
+                    *(self._verts[key] for key in keys),
+                    *(self._texture_coords[key] for key in keys),
+                    *(self._tint_verts[key] for key in keys),
+                    numpy.float32,
+                ),
+            )
+            faces = numpy.empty(int(face_stops[-1]) * self._face_mode, numpy.uint32)
+            texture_index = numpy.empty(int(face_stops[-1]), numpy.uint32)
+            for key, (vert_start, vert_stop), (face_start, face_stop) in zip(
+                FACE_KEY_ORDER, vert_offsets.tolist(), face_offsets.tolist()
+            ):
+                if key in self._faces:
+                    vertices[vert_start:vert_stop, 0:3] = self._verts[key].reshape(
+                        -1, 3
+                    )
+                    vertices[vert_start:vert_stop, 3:5] = self._texture_coords[
+                        key
+                    ].reshape(-1, 2)
+                    vertices[vert_start:vert_stop, 5:8] = self._tint_verts[key].reshape(
+                        -1, 3
+                    )
+                    numpy.add(
+                        self._faces[key],
+                        vert_start,
+                        out=faces[
+                            face_start * self._face_mode : face_stop * self._face_mode
+                        ],
+                        casting="unsafe",
+                    )
+                    texture_index[face_start:face_stop] = self._texture_index[key]
+
+            self._packed = PackedBlockMesh(
+                vertices.ravel(), faces, texture_index, vert_offsets, face_offsets
+            )
+            for array in self._packed:
+                array.setflags(write=False)
+        return self._packed
+
     @property
     def verts(self) -> dict[Optional[str], numpy.ndarray]:
         """A dictionary mapping face cull direction to the vertex table for that direction.
@@ -285,6 +439,20 @@ class BlockMesh:
         """A list of all the texture paths."""
         return self._textures
 
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the arrays of this mesh."""
+        return sum(
+            array.nbytes
+            for array in itertools.chain(
+                self._verts.values(),
+                self._texture_coords.values(),
+                self._tint_verts.values(),
+                self._faces.values(),
+                self._texture_index.values(),
+            )
+        )
+
     @property
     def is_opaque(self) -> bool:
         """
@@ -303,32 +471,220 @@ class BlockMesh:
         """
         return self._transparency
 
+    def compact(self) -> BlockMesh:
+        """Create a version of this mesh using smaller data types.
+        The vertices and texture coords are stored as float32, the tint as uint8
+        and the face and texture indexes as uint16 where they fit.
+        If the mesh already uses these types it is returned unchanged."""
+
+        def index_array(array: numpy.ndarray) -> numpy.ndarray:
+            if array.size == 0 or array.max() <= numpy.iinfo(numpy.uint16).max:
+                return array.astype(numpy.uint16, copy=False)
+            return array
+
+        verts = {
+            key: val.astype(numpy.float32, copy=False)
+            for key, val in self._verts.items()
+        }
+        texture_coords = {
+            key: val.astype(numpy.float32, copy=False)
+            for key, val in self._texture_coords.items()
+        }
+        tint_verts = {
+            key: val.astype(numpy.uint8, copy=False)
+            for key, val in self._tint_verts.items()
+        }
+        faces = {key: index_array(val) for key, val in self._faces.items()}
+        texture_index = {
+            key: index_array(val) for key, val in self._texture_index.items()
+        }
+        if all(
+            new is old
+            for new_table, old_table in (
+                (verts, self._verts),
+                (texture_coords, self._texture_coords),
+                (tint_verts, self._tint_verts),
+                (faces, self._faces),
+                (texture_index, self._texture_index),
+            )
+            for new, old in zip(new_table.values(), old_table.values())
+        ):
+            return self
+
+        return BlockMesh(
+            self._face_mode,
+            verts,
+            texture_coords,
+            tint_verts,
+            faces,
+            texture_index,
+            self._textures,
+            self._transparency,
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialise the mesh to a compact binary format.
+        The arrays are stored contiguously so :meth:`from_bytes` can read them without copying.
+        """
+        direction_mask = 0
+        for bit, cull_dir in enumerate(FACE_KEY_ORDER):
+            if cull_dir in self._faces:
+                direction_mask |= 1 << bit
+        texture_table = "\0".join(self._textures).encode("utf-8")
+        chunks = [
+            _BinaryHeader.pack(
+                _BinaryMagic,
+                _BinaryVersion,
+                self._face_mode,
+                self._transparency,
+                direction_mask,
+                len(self._textures),
+                len(texture_table),
+            ),
+            texture_table,
+            b"\0" * _pad(len(texture_table)),
+        ]
+        for cull_dir in FACE_KEY_ORDER:
+            if cull_dir not in self._faces:
+                continue
+            arrays = [
+                numpy.ascontiguousarray(array)
+                for array in (
+                    self._verts[cull_dir],
+                    self._texture_coords[cull_dir],
+                    self._tint_verts[cull_dir],
+                    self._faces[cull_dir],
+                    self._texture_index[cull_dir],
+                )
+            ]
+            chunks.extend(
+                _BinaryArrayHeader.pack(array.dtype.str.encode("ascii"), array.size)
+                for array in arrays
+            )
+            for array in arrays:
+                chunks.append(array.tobytes())
+                chunks.append(b"\0" * _pad(array.nbytes))
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> BlockMesh:
+        """Load a mesh serialised with :meth:`to_bytes`.
+        The arrays are views into the given buffer so it must not be modified while the mesh is in use.
+        """
+        buffer = memoryview(data)
+        (
+            magic,
+            version,
+            face_width,
+            transparency,
+            direction_mask,
+            texture_count,
+            texture_table_size,
+        ) = _BinaryHeader.unpack_from(buffer)
+        if magic != _BinaryMagic:
+            raise ValueError("The data is not a serialised BlockMesh")
+        if version != _BinaryVersion:
+            raise ValueError(f"Unsupported BlockMesh format version {version}")
+        offset = _BinaryHeader.size
+        if texture_count:
+            textures = tuple(
+                bytes(buffer[offset : offset + texture_table_size])
+                .decode("utf-8")
+                .split("\0")
+            )
+        else:
+            textures = ()
+        offset += texture_table_size + _pad(texture_table_size)
+
+        verts: dict[Optional[str], numpy.ndarray] = {}
+        texture_coords: dict[Optional[str], numpy.ndarray] = {}
+        tint_verts: dict[Optional[str], numpy.ndarray] = {}
+        faces: dict[Optional[str], numpy.ndarray] = {}
+        texture_index: dict[Optional[str], numpy.ndarray] = {}
+        tables = (verts, texture_coords, tint_verts, faces, texture_index)
+        for bit, cull_dir in enumerate(FACE_KEY_ORDER):
+            if not direction_mask & (1 << bit):
+                continue
+            array_headers = []
+            for _ in tables:
+                array_headers.append(_BinaryArrayHeader.unpack_from(buffer, offset))
+                offset += _BinaryArrayHeader.size
+            for table, (dtype_str, size) in zip(tables, array_headers):
+                dtype = numpy.dtype(dtype_str.decode("ascii"))
+                table[cull_dir] = numpy.frombuffer(buffer, dtype, size, offset)
+                offset += dtype.itemsize * size
+                offset += _pad(offset)
+
+        return cls(
+            face_width,
+            verts,
+            texture_coords,
+            tint_verts,
+            faces,
+            texture_index,
+            textures,
+            Transparency(transparency),
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return BlockMesh.from_bytes, (self.to_bytes(),)
+
+    def copy(self) -> BlockMesh:
+        """Create a copy of this mesh with its own writable arrays.
+        The packed data, vertex tables and content hash of the copy are found when first used
+        so they will not reflect changes made to the arrays after that."""
+        mesh = BlockMesh(
+            self._face_mode,
+            {key: val.copy() for key, val in self._verts.items()},
+            {key: val.copy() for key, val in self._texture_coords.items()},
+            {key: val.copy() for key, val in self._tint_verts.items()},
+            {key: val.copy() for key, val in self._faces.items()},
+            {key: val.copy() for key, val in self._texture_index.items()},
+            self._textures,
+            self._transparency,
+        )
+        for array in itertools.chain(
+            mesh._verts.values(),
+            mesh._texture_coords.values(),
+            mesh._tint_verts.values(),
+            mesh._faces.values(),
+            mesh._texture_index.values(),
+        ):
+            array.setflags(write=True)
+        return mesh
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> BlockMesh:
+        return self.copy()
+
     def rotate(self, rotx: int, roty: int) -> BlockMesh:
         """Create a rotated version of this block model. Culling directions are also rotated.
         rotx and roty must be ints in the range -3 to 3 inclusive."""
         if rotx or roty and (roty, rotx) in cull_remap_all:
             cull_remap = cull_remap_all[(roty, rotx)]
+            rotation_matrix = rotation_matrices_all[(roty, rotx)]
+            # rotate the verts of all cull directions at once and split them back
+            cull_dirs = list(self.verts)
+            if cull_dirs:
+                rotated_verts = numpy.split(
+                    numpy.matmul(
+                        numpy.concatenate(
+                            [self.verts[cull_dir] for cull_dir in cull_dirs], None
+                        ).reshape((-1, 3))
+                        - 0.5,
+                        rotation_matrix,
+                    )
+                    + 0.5,
+                    numpy.cumsum(
+                        [self.verts[cull_dir].size // 3 for cull_dir in cull_dirs[:-1]]
+                    ),
+                )
+            else:
+                rotated_verts = []
             return BlockMesh(
                 self.face_mode,
                 {
-                    cull_remap[cull_dir]: rotate_3d(
-                        rotate_3d(
-                            self.verts[cull_dir].reshape((-1, self.face_mode)),
-                            rotx * 90,
-                            0,
-                            0,
-                            0.5,
-                            0.5,
-                            0.5,
-                        ),
-                        0,
-                        roty * 90,
-                        0,
-                        0.5,
-                        0.5,
-                        0.5,
-                    ).ravel()
-                    for cull_dir in self.verts
+                    cull_remap[cull_dir]: verts.ravel()
+                    for cull_dir, verts in zip(cull_dirs, rotated_verts)
                 },
                 {
                     cull_remap[cull_dir]: self.texture_coords[cull_dir]
@@ -348,9 +704,57 @@ class BlockMesh:
             )
         return self
 
+    @property
+    def content_hash(self) -> bytes:
+        """A hash of the data in this mesh.
+        Meshes that compare equal have the same content hash even if their arrays use different data types.
+        """
+        if self._content_hash is None:
+            content_hash = hashlib.blake2b(digest_size=16)
+            content_hash.update(
+                struct.pack(
+                    "<BBI", self._face_mode, self._transparency, len(self._textures)
+                )
+            )
+            for texture in self._textures:
+                texture_bytes = texture.encode("utf-8")
+                content_hash.update(struct.pack("<I", len(texture_bytes)))
+                content_hash.update(texture_bytes)
+            for key_index, key in enumerate(FACE_KEY_ORDER):
+                for table_index, (table, dtype) in enumerate(
+                    (
+                        (self._verts, numpy.float64),
+                        (self._texture_coords, numpy.float64),
+                        (self._tint_verts, numpy.float64),
+                        (self._faces, numpy.uint64),
+                        (self._texture_index, numpy.uint64),
+                    )
+                ):
+                    if key in table:
+                        # Convert to a common data type so that the hash matches __eq__.
+                        # Adding zero converts -0.0 to 0.0 which compare equal.
+                        array = numpy.asarray(table[key], dtype) + dtype(0)
+                        content_hash.update(
+                            struct.pack("<BBQ", key_index, table_index, array.size)
+                        )
+                        content_hash.update(array.tobytes())
+            self._content_hash = content_hash.digest()
+        return self._content_hash
+
+    def __hash__(self) -> int:
+        return hash(self.content_hash)
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, BlockMesh):
             return NotImplemented
+        if self is other:
+            return True
+        if (
+            self._content_hash is not None
+            and other._content_hash is not None
+            and self._content_hash != other._content_hash
+        ):
+            return False
         return (
             self.face_mode == other.face_mode
             and all(
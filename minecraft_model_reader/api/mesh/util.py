@@ -1,17 +1,30 @@
 import numpy
 
 
+def rotation_matrix_3d(angles: numpy.ndarray) -> numpy.ndarray:
+    """Create rotation matrices from an array of x, y, z angles in degrees.
+
+    :param angles: A float array of shape (..., 3)
+    :return: A float array of shape (..., 3, 3)
+    """
+    radians = numpy.radians(angles)
+    sb, sh, sa = numpy.moveaxis(numpy.sin(radians), -1, 0)
+    cb, ch, ca = numpy.moveaxis(numpy.cos(radians), -1, 0)
+    return numpy.stack(
+        [
+            numpy.stack([ch * ca, -ch * sa * cb + sh * sb, ch * sa * sb + sh * cb], -1),
+            numpy.stack([sa, ca * cb, -ca * sb], -1),
+            numpy.stack(
+                [-sh * ca, sh * sa * cb + ch * sb, -sh * sa * sb + ch * cb], -1
+            ),
+        ],
+        -2,
+    )
+
+
 def rotate_3d(
     verts: numpy.ndarray, x: float, y: float, z: float, dx: float, dy: float, dz: float
 ) -> numpy.ndarray:
-    sb, sh, sa = numpy.sin(numpy.radians([x, y, z]))
-    cb, ch, ca = numpy.cos(numpy.radians([x, y, z]))
-    trmtx = numpy.array(
-        [
-            [ch * ca, -ch * sa * cb + sh * sb, ch * sa * sb + sh * cb],
-            [sa, ca * cb, -ca * sb],
-            [-sh * ca, sh * sa * cb + ch * sb, -sh * sa * sb + ch * cb],
-        ]
-    )
+    trmtx = rotation_matrix_3d(numpy.array([x, y, z], float))
     origin = numpy.array([dx, dy, dz])
     return numpy.matmul(verts - origin, trmtx) + origin  # type: ignore
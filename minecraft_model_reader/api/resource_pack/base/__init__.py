@@ -1,2 +1,3 @@
 from .resource_pack import BaseResourcePack
 from .resource_pack_manager import BaseResourcePackManager
+from .model_cache import ModelCache, ModelCacheInfo
@@ -0,0 +1,142 @@
+from typing import Optional, NamedTuple, Callable
+from collections import OrderedDict
+
+from minecraft_model_reader.api import Block, BlockMesh
+
+
+class ModelCacheInfo(NamedTuple):
+    hits: int  # the number of lookups that found a model
+    misses: int  # the number of lookups that did not find a model
+    evictions: int  # the number of models removed to stay within the limits
+    entries: int  # the number of models currently stored
+    nbytes: int  # the size of the arrays of the unique models currently stored
+    max_entries: Optional[int]  # the maximum number of models. None if unbounded
+    max_bytes: Optional[int]  # the maximum size of the arrays. None if unbounded
+    unique_entries: int  # the number of distinct models shared by the stored entries
+
+
+class ModelCache:
+    """A least recently used cache of block models.
+    Can be bounded by the number of models and by the size of their arrays.
+    Models with the same content are interned so that all entries share one instance."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        on_evict: Optional[Callable[[Block, BlockMesh], None]] = None,
+    ) -> None:
+        """
+        :param max_entries: The maximum number of models to store. None for no limit.
+        :param max_bytes: The maximum size of the model arrays to store. None for no limit.
+        :param on_evict: A function called with the block and model of each model evicted to stay within the limits.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be None or at least 1")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be None or at least 0")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._on_evict = on_evict
+        self._models: OrderedDict[Block, BlockMesh] = OrderedDict()
+        # content hash -> the shared model and the number of entries using it
+        self._interned: dict[bytes, tuple[BlockMesh, int]] = {}
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __contains__(self, block: Block) -> bool:
+        return block in self._models
+
+    @property
+    def info(self) -> ModelCacheInfo:
+        """The statistics and limits of the cache."""
+        return ModelCacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            len(self._models),
+            self._nbytes,
+            self._max_entries,
+            self._max_bytes,
+            len(self._interned),
+        )
+
+    def get(self, block: Block) -> Optional[BlockMesh]:
+        """Get the model stored for the block and mark it as the most recently used.
+
+        :return: The model or None if it is not stored.
+        """
+        model = self._models.get(block)
+        if model is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._models.move_to_end(block)
+        return model
+
+    def touch(self, block: Block) -> None:
+        """Count a hit for a stored model that was found without :meth:`get` and mark it as the most recently used."""
+        self._hits += 1
+        self._models.move_to_end(block)
+
+    def _intern(self, model: BlockMesh) -> BlockMesh:
+        """Get the shared instance of the model and add a reference to it."""
+        content_hash = model.content_hash
+        interned = self._interned.get(content_hash)
+        if interned is not None and interned[0] == model:
+            model, count = interned
+            self._interned[content_hash] = (model, count + 1)
+        elif interned is None:
+            self._interned[content_hash] = (model, 1)
+            self._nbytes += model.nbytes
+        # If the hashes match but the models do not the model is stored without being shared.
+        return model
+
+    def _release(self, model: BlockMesh) -> None:
+        """Remove a reference to a model added by _intern."""
+        content_hash = model.content_hash
+        interned = self._interned.get(content_hash)
+        if interned is not None and interned[0] is model:
+            count = interned[1] - 1
+            if count:
+                self._interned[content_hash] = (model, count)
+            else:
+                del self._interned[content_hash]
+                self._nbytes -= model.nbytes
+
+    def put(self, block: Block, model: BlockMesh) -> BlockMesh:
+        """Store a model for the block and evict the least recently used models if over the limits.
+        The model just stored is never evicted.
+
+        :return: The stored model. If an equal model is already stored this is that instance.
+        """
+        old_model = self._models.pop(block, None)
+        if old_model is not None:
+            self._release(old_model)
+        model = self._models[block] = self._intern(model)
+        while len(self._models) > 1 and (
+            (self._max_entries is not None and len(self._models) > self._max_entries)
+            or (self._max_bytes is not None and self._nbytes > self._max_bytes)
+        ):
+            evicted_block, evicted = self._models.popitem(last=False)
+            self._release(evicted)
+            self._evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(evicted_block, evicted)
+        return model
+
+    def items(self) -> list[tuple[Block, BlockMesh]]:
+        """The stored blocks and models from the least to the most recently used.
+        This does not change the statistics or the order."""
+        return list(self._models.items())
+
+    def clear(self) -> None:
+        """Remove all stored models. The statistics are kept."""
+        self._models.clear()
+        self._interned.clear()
+        self._nbytes = 0
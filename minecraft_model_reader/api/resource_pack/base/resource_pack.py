@@ -7,6 +7,7 @@ class BaseResourcePack:
     def __init__(self, root_dir: str):
         self._valid_pack = False
         self._root_dir = root_dir
+        self._in_archive = False
         self._pack_description = ""
         self._pack_icon = default_pack_icon_path
 
@@ -27,6 +28,11 @@ class BaseResourcePack:
         """str - the root directory of the pack"""
         return self._root_dir
 
+    @property
+    def in_archive(self) -> bool:
+        """bool - is the pack read from a zip file. If True the files must be read with :mod:`minecraft_model_reader.api.archive`"""
+        return self._in_archive
+
     @property
     def pack_description(self) -> str:
         """str - the description as described in the pack"""
@@ -34,5 +40,7 @@ class BaseResourcePack:
 
     @property
     def pack_icon(self) -> str:
-        """str - path to the pack icon"""
+        """str - path to the pack icon
+        This may be a path within a zip file. Use :func:`minecraft_model_reader.api.archive.open_resource` to read it.
+        """
         return self._pack_icon
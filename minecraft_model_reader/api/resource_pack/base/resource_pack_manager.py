@@ -1,11 +1,19 @@
-from typing import Optional, Iterator, TypeVar, Generic
+from typing import Optional, Iterator, TypeVar, Generic, BinaryIO
+from collections.abc import Sequence
+from concurrent.futures import Executor
 import json
-import copy
+import numpy
 
 from minecraft_model_reader.api import Block, BlockMesh
 from minecraft_model_reader.api.resource_pack.base.resource_pack import BaseResourcePack
 from minecraft_model_reader.api.image import missing_no_path
+from minecraft_model_reader.api.archive import open_resource
+from minecraft_model_reader.api.image.transparency import TextureTransparency
 from minecraft_model_reader.api.mesh.block.missing_block import get_missing_block
+from minecraft_model_reader.api.resource_pack.base.model_cache import (
+    ModelCache,
+    ModelCacheInfo,
+)
 
 PackT = TypeVar("PackT", bound=BaseResourcePack)
 
@@ -13,25 +21,68 @@ PackT = TypeVar("PackT", bound=BaseResourcePack)
 class BaseResourcePackManager(Generic[PackT]):
     """The base class that all resource pack managers must inherit from. Defines the base api."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_cached_models: Optional[int] = None,
+        max_cached_model_bytes: Optional[int] = None,
+        compact_models: bool = False,
+    ) -> None:
+        """
+        :param max_cached_models: The maximum number of block models to cache. None for no limit.
+        :param max_cached_model_bytes: The maximum size of the arrays of the cached block models. None for no limit.
+            The least recently used models are removed when over either limit.
+            Only the models in this cache are counted by :attr:`model_cache_info`.
+            Intermediate models a manager keeps to build them are not.
+        :param compact_models: If True the block models use float32 vertices and texture coords,
+            uint8 tint and uint16 indexes where they fit. See :meth:`BlockMesh.compact`.
+        """
         self._packs: list[PackT] = []
         self._missing_block: Optional[BlockMesh] = None
-        self._texture_is_transparent: dict[str, tuple[float, bool]] = {}
-        self._cached_models: dict[Block, BlockMesh] = {}
+        self._texture_is_transparent: dict[str, tuple[float, int]] = {}
+        self._cached_models = ModelCache(
+            max_cached_models, max_cached_model_bytes, self._on_model_evicted
+        )
+        self._compact_models = compact_models
+        # Block states registered by register_palette. The index is the block id.
+        self._block_ids: dict[Block, int] = {}
+        self._id_blocks: list[Block] = []
+        # The models of the registered blocks that are in the model cache. None if not in the cache.
+        self._id_models: list[Optional[BlockMesh]] = []
+
+    def _on_model_evicted(self, block: Block, model: BlockMesh) -> None:
+        """Remove a model evicted from the model cache from the block id table so it can be freed."""
+        block_id = self._block_ids.get(block)
+        if block_id is not None:
+            self._id_models[block_id] = None
 
     @property
     def pack_paths(self) -> list[str]:
         return [pack.root_dir for pack in self._packs]
 
+    @property
+    def model_cache_info(self) -> ModelCacheInfo:
+        """The hit, miss and eviction counts, size and limits of the block model cache.
+        unique_entries compared to entries shows how many block states share a model."""
+        return self._cached_models.info
+
     def _unload(self) -> None:
         """Clear all loaded resources."""
         self._texture_is_transparent.clear()
         self._cached_models.clear()
+        # The block ids stay the same but the models need rebuilding
+        self._id_models = [None] * len(self._id_blocks)
 
     def _load_transparency_cache(self, path: str) -> None:
         try:
             with open(path) as f:
-                self._texture_is_transparent = json.load(f)
+                texture_is_transparent = json.load(f)
+            # Older versions stored a bool which does not distinguish cutout and translucent textures.
+            # Drop those entries so that they get checked again.
+            self._texture_is_transparent = {
+                texture_path: value
+                for texture_path, value in texture_is_transparent.items()
+                if not isinstance(value[1], bool)
+            }
         except:
             pass
 
@@ -57,25 +108,157 @@ class BaseResourcePackManager(Generic[PackT]):
 
     @property
     def textures(self) -> tuple[str, ...]:
-        """Returns a tuple of all the texture paths in the resource pack."""
+        """Returns a tuple of all the texture paths in the resource pack.
+        Textures from zip packs are not on the file system. Use :meth:`open_texture` to read them.
+        """
         raise NotImplementedError
 
     def get_texture_path(self, namespace: Optional[str], relative_path: str) -> str:
-        """Get the absolute texture path from the namespace and relative path pair"""
+        """Get the absolute texture path from the namespace and relative path pair.
+        Textures from zip packs are not on the file system. Use :meth:`open_texture` to read them.
+        """
         raise NotImplementedError
 
-    def get_block_model(self, block: Block) -> BlockMesh:
+    def open_texture(self, texture_path: str) -> BinaryIO:
+        """Open a texture path found by this resource pack manager for reading in binary mode.
+        Textures may be within a zip file so this should be used instead of :func:`open`.
+        The result can be passed to :func:`PIL.Image.open`."""
+        return open_resource(texture_path)
+
+    def get_texture_transparency(self, texture_path: str) -> TextureTransparency:
+        """Get the transparency of a texture found by this resource pack manager."""
+        return TextureTransparency(self._texture_is_transparent[texture_path][1])
+
+    def get_block_model(self, block: Block, copy: bool = False) -> BlockMesh:
         """Get a model for a block state.
-        The block should already be in the resource pack format"""
-        if block not in self._cached_models:
-            if block.extra_blocks:
-                self._cached_models[block] = BlockMesh.merge(
-                    (self._get_model(block.base_block),)
-                    + tuple(self._get_model(block_) for block_ in block.extra_blocks)
-                )
+        The block should already be in the resource pack format
+
+        :param block: The block state to get the model for.
+        :param copy: If False (default) the cached model is returned. It is shared between callers and its arrays are read only.
+            If True a copy with its own writable arrays is returned which the caller is free to modify.
+            See :meth:`BlockMesh.copy`.
+        """
+        model = self._cached_models.get(block)
+        if model is None:
+            model = self._cached_models.put(block, self._build_model(block))
+        if copy:
+            return model.copy()
+        return model
+
+    def get_block_models(
+        self,
+        blocks: Sequence[Block],
+        copy: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> list[BlockMesh]:
+        """Get the models for a sequence of block states.
+        Each unique block is only looked up once and the blocks not in the cache are built together.
+
+        :param blocks: The block states to get the models for. They should already be in the resource pack format.
+        :param copy: If True copies of the models with their own writable arrays are returned. See :meth:`get_block_model`.
+        :param executor: If given the models not in the cache are built in parallel using this executor.
+        :return: A list of models in the same order as blocks.
+        """
+        models: dict[Block, BlockMesh] = {}
+        missing: list[Block] = []
+        for block in dict.fromkeys(blocks):
+            model = self._cached_models.get(block)
+            if model is None:
+                missing.append(block)
+            else:
+                models[block] = model
+
+        if missing:
+            # group the variants of each block so their blockstate data is used together
+            missing.sort(key=lambda block_: block_.namespaced_name)
+            if executor is None:
+                built = list(map(self._build_model, missing))
             else:
-                self._cached_models[block] = self._get_model(block)
-        return copy.deepcopy(self._cached_models[block])
+                built = list(executor.map(self._build_model, missing))
+            for block, model in zip(missing, built):
+                models[block] = self._cached_models.put(block, model)
+
+        if copy:
+            return [models[block].copy() for block in blocks]
+        return [models[block] for block in blocks]
+
+    def get_palette_block_models(
+        self,
+        palette: Sequence[Block],
+        indices: numpy.ndarray,
+        copy: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> list[Optional[BlockMesh]]:
+        """Get the models for the palette entries used by an index array.
+
+        :param palette: The block states indexed by indices.
+        :param indices: An integer array of indices into palette.
+        :param copy: If True copies of the models with their own writable arrays are returned. See :meth:`get_block_model`.
+        :param executor: If given the models not in the cache are built in parallel using this executor.
+        :return: A list the same length as palette. Entries not used by indices are None.
+        """
+        used = numpy.unique(indices).tolist()
+        models: list[Optional[BlockMesh]] = [None] * len(palette)
+        for index, model in zip(
+            used,
+            self.get_block_models([palette[index] for index in used], copy, executor),
+        ):
+            models[index] = model
+        return models
+
+    def register_palette(self, blocks: Sequence[Block]) -> numpy.ndarray:
+        """Get an integer id for each block state.
+        Blocks that have not been seen before are given new ids.
+        The ids are stable for the lifetime of this manager, including across reloads.
+
+        :param blocks: The block states to get ids for. They should already be in the resource pack format.
+        :return: A uint32 array of the block ids in the same order as blocks.
+        """
+        block_ids = numpy.empty(len(blocks), numpy.uint32)
+        for index, block in enumerate(blocks):
+            block_id = self._block_ids.get(block)
+            if block_id is None:
+                block_id = self._block_ids[block] = len(self._id_blocks)
+                self._id_blocks.append(block)
+                self._id_models.append(None)
+            block_ids[index] = block_id
+        return block_ids
+
+    def get_block_by_id(self, block_id: int) -> Block:
+        """Get the block state with an id given by :meth:`register_palette`."""
+        return self._id_blocks[block_id]
+
+    def get_block_model_by_id(self, block_id: int, copy: bool = False) -> BlockMesh:
+        """Get the model for a block id given by :meth:`register_palette`.
+        The cached models are also stored in a list indexed by block id so they can be found without a lookup by block state.
+        Models evicted from the model cache are removed from the list so the cache limits apply to both.
+
+        :param block_id: The block id to get the model for.
+        :param copy: If True a copy with its own writable arrays is returned. See :meth:`get_block_model`.
+        """
+        model = self._id_models[block_id]
+        if model is None:
+            model = self._id_models[block_id] = self.get_block_model(
+                self._id_blocks[block_id]
+            )
+        else:
+            self._cached_models.touch(self._id_blocks[block_id])
+        if copy:
+            return model.copy()
+        return model
+
+    def _build_model(self, block: Block) -> BlockMesh:
+        """Build the model for a block state including its extra blocks."""
+        if block.extra_blocks:
+            model = BlockMesh.merge(
+                (self._get_model(block.base_block),)
+                + tuple(self._get_model(block_) for block_ in block.extra_blocks)
+            )
+        else:
+            model = self._get_model(block)
+        if self._compact_models:
+            model = model.compact()
+        return model
 
     def _get_model(self, block: Block) -> BlockMesh:
         raise NotImplementedError
@@ -1,13 +1,17 @@
 import os
 import json
 from typing import Union, Iterable, Generator, Optional, TypedDict, Literal, Any
-from PIL import Image
-import numpy
 
 from minecraft_model_reader.api import Block, comment_json
 from minecraft_model_reader.api.resource_pack import BaseResourcePackManager
 from minecraft_model_reader.api.resource_pack.bedrock import BedrockResourcePack
 from minecraft_model_reader.api.mesh.block.block_mesh import BlockMesh
+from minecraft_model_reader.api.image.transparency import get_texture_transparency
+from minecraft_model_reader.api.archive import (
+    resource_isfile,
+    resource_mtime,
+    open_resource,
+)
 from .blockshapes import BlockShapeClasses
 
 
@@ -97,8 +101,19 @@ class BedrockResourcePackManager(BaseResourcePackManager):
         self,
         resource_packs: Union[BedrockResourcePack, Iterable[BedrockResourcePack]],
         load: bool = True,
+        max_cached_models: Optional[int] = None,
+        max_cached_model_bytes: Optional[int] = None,
+        compact_models: bool = False,
     ) -> None:
-        super().__init__()
+        """
+        :param resource_packs: The resource packs to load. Later packs overwrite earlier ones.
+        :param load: Should the resource packs be loaded now.
+        :param max_cached_models: The maximum number of block models to cache. None for no limit.
+        :param max_cached_model_bytes: The maximum size of the arrays of the cached block models. None for no limit.
+        :param compact_models: If True the block models use float32 vertices and texture coords,
+            uint8 tint and uint16 indexes where they fit.
+        """
+        super().__init__(max_cached_models, max_cached_model_bytes, compact_models)
         self._block_shapes: dict[str, str] = {}  # block string to block shape
         self._blocks: dict[str, Union[dict[str, str], str, None]] = (
             {}
@@ -109,7 +124,7 @@ class BedrockResourcePackManager(BaseResourcePackManager):
         self._textures: dict[str, str] = {}  # relative path to texture path
         self._all_textures = None
 
-        self._texture_is_transparent: dict[str, tuple[float, bool]] = {}
+        self._texture_is_transparent: dict[str, tuple[float, int]] = {}
 
         if isinstance(resource_packs, (list, tuple)):
             self._packs = [
@@ -132,27 +147,28 @@ class BedrockResourcePackManager(BaseResourcePackManager):
         self._textures.clear()
         self._all_textures = None
 
-    def _check_texture(self, texture_path: str) -> str:
-        if os.path.isfile(texture_path + ".png"):
+    def _check_texture(self, texture_path: str, archive: bool = False) -> str:
+        """Find the texture file for a texture path without an extension and check its transparency.
+
+        :param texture_path: The texture path without the extension.
+        :param archive: Is the texture in a zip file. If False the file system is used directly.
+        :return: The path to the texture file or the missing texture.
+        """
+        isfile = resource_isfile if archive else os.path.isfile
+        if isfile(texture_path + ".png"):
             texture_path += ".png"
-        elif os.path.isfile(texture_path + ".tga"):
+        elif isfile(texture_path + ".tga"):
             texture_path += ".tga"
         else:
             texture_path = self.missing_no
-        if (
-            os.stat(texture_path).st_mtime
-            != self._texture_is_transparent.get(texture_path, [0])[0]
-        ):
-            im: Image.Image = Image.open(texture_path)
-            if im.mode == "RGBA":
-                alpha = numpy.array(im.getchannel("A").getdata())
-                texture_is_transparent = bool(numpy.any(alpha != 255))
-            else:
-                texture_is_transparent = False
-
+            archive = False
+        mtime = (
+            resource_mtime(texture_path) if archive else os.stat(texture_path).st_mtime
+        )
+        if mtime != self._texture_is_transparent.get(texture_path, [0])[0]:
             self._texture_is_transparent[texture_path] = (
-                os.stat(texture_path).st_mtime,
-                bool(texture_is_transparent),
+                mtime,
+                get_texture_transparency(texture_path),
             )
         return texture_path
 
@@ -179,9 +195,9 @@ class BedrockResourcePackManager(BaseResourcePackManager):
                 terrain_texture_path = os.path.join(
                     pack.root_dir, "textures", "terrain_texture.json"
                 )
-                if os.path.isfile(terrain_texture_path):
+                if resource_isfile(terrain_texture_path):
                     try:
-                        with open(terrain_texture_path) as f:
+                        with open_resource(terrain_texture_path, "r") as f:
                             terrain_texture = comment_json.load(f)
                     except json.JSONDecodeError:
                         pass
@@ -202,7 +218,8 @@ class BedrockResourcePackManager(BaseResourcePackManager):
                                     assert isinstance(_relative_path, str)
                                 if isinstance(_relative_path, str):
                                     full_path = self._check_texture(
-                                        os.path.join(pack.root_dir, _relative_path)
+                                        os.path.join(pack.root_dir, _relative_path),
+                                        pack.in_archive,
                                     )
                                     if _relative_path in self._textures:
                                         if full_path != self.missing_no:
@@ -237,9 +254,9 @@ class BedrockResourcePackManager(BaseResourcePackManager):
                 sub_progress = pack_progress + 1 / (pack_count * 2)
                 yield sub_progress
                 blocks_path = os.path.join(pack.root_dir, "blocks.json")
-                if os.path.isfile(blocks_path):
+                if resource_isfile(blocks_path):
                     try:
-                        with open(blocks_path) as f:
+                        with open_resource(blocks_path, "r") as f:
                             blocks = comment_json.load(f)
                     except json.JSONDecodeError:
                         pass
@@ -273,11 +290,15 @@ class BedrockResourcePackManager(BaseResourcePackManager):
 
     @property
     def textures(self) -> tuple[str, ...]:
-        """Returns a tuple of all the texture paths in the resource pack."""
+        """Returns a tuple of all the texture paths in the resource pack.
+        Textures from zip packs are not on the file system. Use :meth:`open_texture` to read them.
+        """
         return tuple(self._textures.values())
 
     def get_texture_path(self, namespace: Optional[str], relative_path: str) -> str:
-        """Get the absolute texture path from the namespace and relative path pair"""
+        """Get the absolute texture path from the namespace and relative path pair.
+        Textures from zip packs are not on the file system. Use :meth:`open_texture` to read them.
+        """
         if relative_path in self._textures:
             return self._textures[relative_path]
         else:
@@ -302,7 +323,7 @@ class BedrockResourcePackManager(BaseResourcePackManager):
                 up = down = north = east = south = west = self._get_texture(
                     texture_id, texture_index
                 )
-                transparent = (self._texture_is_transparent[up][1],) * 6
+                transparent = (bool(self.get_texture_transparency(up)),) * 6
 
             elif isinstance(texture_id, dict):
                 down = self._get_texture(
@@ -315,9 +336,9 @@ class BedrockResourcePackManager(BaseResourcePackManager):
                         texture_id.get("side", "missing"), texture_index
                     )
                     transparent = (
-                        self._texture_is_transparent[down][1],
-                        self._texture_is_transparent[up][1],
-                    ) + (self._texture_is_transparent[north][1],) * 4
+                        bool(self.get_texture_transparency(down)),
+                        bool(self.get_texture_transparency(up)),
+                    ) + (bool(self.get_texture_transparency(north)),) * 4
                 else:
                     north = self._get_texture(
                         texture_id.get("north", "missing"), texture_index
@@ -332,18 +353,18 @@ class BedrockResourcePackManager(BaseResourcePackManager):
                         texture_id.get("west", "missing"), texture_index
                     )
                     transparent = (
-                        self._texture_is_transparent[down][1],
-                        self._texture_is_transparent[up][1],
-                        self._texture_is_transparent[north][1],
-                        self._texture_is_transparent[east][1],
-                        self._texture_is_transparent[south][1],
-                        self._texture_is_transparent[west][1],
+                        bool(self.get_texture_transparency(down)),
+                        bool(self.get_texture_transparency(up)),
+                        bool(self.get_texture_transparency(north)),
+                        bool(self.get_texture_transparency(east)),
+                        bool(self.get_texture_transparency(south)),
+                        bool(self.get_texture_transparency(west)),
                     )
             else:
                 up = down = north = east = south = west = self._get_texture(
                     "missing", texture_index
                 )
-                transparent = (self._texture_is_transparent[up][1],) * 6
+                transparent = (bool(self.get_texture_transparency(up)),) * 6
 
             return block_shape_class.get_block_model(
                 block, down, up, north, east, south, west, transparent
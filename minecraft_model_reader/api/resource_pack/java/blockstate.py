@@ -0,0 +1,137 @@
+from typing import Any, Optional, Union
+from collections.abc import Mapping, Sequence
+import logging
+
+from minecraft_model_reader.api import Block, BlockMesh
+
+"""
+Java blockstate files are compiled into these classes when they are loaded
+so that finding the model(s) for a block does not need to parse the file again.
+The property values passed to the find methods are the py_data of the block properties.
+Only string values can match.
+"""
+
+log = logging.getLogger(__name__)
+
+# A condition is satisfied if any of its clauses are satisfied.
+# A clause is satisfied if the block has all the properties with one of the allowed values.
+ConditionType = tuple[tuple[tuple[str, frozenset[str]], ...], ...]
+
+
+class VariantMatcher:
+    """Finds the entries of a "variants" blockstate file that match a block."""
+
+    def __init__(self, variants: Mapping[str, Any]):
+        # The variants grouped by the property names they use.
+        # Each group maps the property values to the variant index and value.
+        # Most files use the same property names in every variant so there is usually only one group.
+        self._groups: dict[tuple[str, ...], dict[tuple[str, ...], tuple[int, Any]]] = {}
+        for index, (variant, value) in enumerate(variants.items()):
+            properties = {
+                match.group("name"): match.group("value")
+                for match in Block.properties_regex.finditer(f",{variant}")
+            }
+            names = tuple(sorted(properties))
+            self._groups.setdefault(names, {}).setdefault(
+                tuple(properties[name] for name in names), (index, value)
+            )
+
+    def find(self, properties: Mapping[str, Any]) -> list[Any]:
+        """Find the variant values that match the given properties in the order they are defined.
+        A property the block does not have matches any value."""
+        matches: list[tuple[int, Any]] = []
+        for names, variants in self._groups.items():
+            if all(name in properties for name in names):
+                match = variants.get(tuple(properties[name] for name in names))
+                if match is not None:
+                    matches.append(match)
+            else:
+                # Properties the block does not define are a wildcard so check every variant
+                checks = [
+                    (name_index, properties[name])
+                    for name_index, name in enumerate(names)
+                    if name in properties
+                ]
+                matches.extend(
+                    match
+                    for values, match in variants.items()
+                    if all(values[name_index] == value for name_index, value in checks)
+                )
+        if len(matches) > 1:
+            matches.sort(key=lambda match_: match_[0])
+        return [value for _, value in matches]
+
+
+def parse_state_values(val: Union[str, bool]) -> frozenset[str]:
+    """Convert a property value from a multipart condition into the set of values it allows."""
+    if isinstance(val, str):
+        return frozenset(val.split("|"))
+    elif isinstance(val, bool):
+        return frozenset(("true" if val else "false",))
+    else:
+        raise Exception(f"Could not parse state val {val}")
+
+
+def compile_condition(when: Optional[Mapping[str, Any]]) -> ConditionType:
+    """Compile the "when" entry of a multipart case."""
+
+    def compile_clause(
+        properties: Mapping[str, Any],
+    ) -> tuple[tuple[str, frozenset[str]], ...]:
+        return tuple(
+            (name, parse_state_values(val)) for name, val in properties.items()
+        )
+
+    if when is None:
+        return ((),)
+    elif "OR" in when:
+        return tuple(compile_clause(properties) for properties in when["OR"])
+    elif "AND" in when:
+        return (
+            tuple(
+                condition
+                for properties in when["AND"]
+                for condition in compile_clause(properties)
+            ),
+        )
+    else:
+        return (compile_clause(when),)
+
+
+class MultipartCase:
+    """A case from a "multipart" blockstate file."""
+
+    __slots__ = ("condition", "apply", "model")
+
+    def __init__(self, condition: ConditionType, apply: Any):
+        self.condition = condition
+        self.apply = apply
+        # The model built from apply. This is populated by the resource pack manager.
+        self.model: Optional[BlockMesh] = None
+
+    def matches(self, properties: Mapping[str, Any]) -> bool:
+        return any(
+            all(properties.get(name) in values for name, values in clause)
+            for clause in self.condition
+        )
+
+
+class MultipartMatcher:
+    """Finds the cases of a "multipart" blockstate file that apply to a block."""
+
+    def __init__(self, multipart: Sequence[Any]):
+        self._cases: list[MultipartCase] = []
+        for case in multipart:
+            try:
+                if "apply" in case:
+                    self._cases.append(
+                        MultipartCase(
+                            compile_condition(case.get("when")), case["apply"]
+                        )
+                    )
+            except Exception as e:
+                log.error(f"Failed to parse multipart case {case}\n{e}")
+
+    def find(self, properties: Mapping[str, Any]) -> list[MultipartCase]:
+        """Find the cases whose condition is satisfied by the given properties in the order they are defined."""
+        return [case for case in self._cases if case.matches(properties)]
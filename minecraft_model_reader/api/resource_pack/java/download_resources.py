@@ -4,10 +4,15 @@ import zipfile
 import json
 from urllib.request import urlopen, Request
 import io
-from typing import Generator, TypeVar, Any, Optional
+import tempfile
+import time
+from typing import Generator, TypeVar, Any, Optional, BinaryIO
 import logging
 
 from minecraft_model_reader.api.resource_pack import JavaResourcePack
+from minecraft_model_reader.api.resource_pack.java.resource_pack_manager import (
+    UselessImageGroups,
+)
 
 T = TypeVar("T")
 
@@ -15,6 +20,13 @@ log = logging.getLogger(__name__)
 
 launcher_manifest: Optional[dict] = None
 INCLUDE_SNAPSHOT = False
+# If False only the files read by the resource pack manager are extracted from the client jar.
+EXTRACT_ALL_ASSETS = False
+
+# The size of the first read of a download. This grows or shrinks depending on how long each read takes.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAX_DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+MIN_DOWNLOAD_CHUNK_SIZE = 16 * 1024
 
 
 def get_launcher_manifest() -> dict:
@@ -126,37 +138,95 @@ def _remove_and_download_iter(path: str, version: str) -> Generator[float, None,
         f.write(version)
 
 
-def download_with_retry(
-    url: str, chunk_size: int = 4096, attempts: int = 5
-) -> Generator[float, None, bytes]:
+def download_to_file_with_retry(
+    url: str,
+    f: BinaryIO,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    attempts: int = 5,
+) -> Generator[float, None, None]:
+    """Download a file into an open binary file object.
+    If the connection fails the download is resumed from where it stopped.
+
+    :param url: The url to download.
+    :param f: The file to write to. This must be writable and seekable.
+    :param chunk_size: The initial read size. This adapts to the speed of the connection.
+    :param attempts: The number of times to try connecting.
+    :return: A generator of the download progress from 0 to 1.
+    """
     content_length_found = 0
-    content = []
+    content_length: Optional[int] = None
 
-    for _ in range(attempts):
+    for attempt in range(attempts):
         request = Request(url, headers={"Range": f"bytes={content_length_found}-"})
-        with urlopen(request, timeout=20) as response:
-            content_length = int(response.headers["content-length"].strip())
-            while content_length_found < content_length:
-                chunk = response.read(chunk_size)
-                if not chunk:
-                    break
-                content.append(chunk)
-                content_length_found += len(chunk)
-                yield min(1.0, content_length_found / content_length)
+        try:
+            with urlopen(request, timeout=20) as response:
+                if response.status == 206:
+                    # The server sent the remainder of the file
+                    content_length = content_length_found + int(
+                        response.headers["content-length"].strip()
+                    )
+                else:
+                    # The server sent the whole file so start again
+                    content_length = int(response.headers["content-length"].strip())
+                    content_length_found = 0
+                    f.seek(0)
+                    f.truncate()
+                while content_length_found < content_length:
+                    start_time = time.perf_counter()
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    content_length_found += len(chunk)
+                    # aim for reads that take between 0.05 and 0.5 seconds
+                    read_time = time.perf_counter() - start_time
+                    if read_time < 0.05 and len(chunk) == chunk_size:
+                        chunk_size = min(chunk_size * 2, MAX_DOWNLOAD_CHUNK_SIZE)
+                    elif read_time > 0.5:
+                        chunk_size = max(chunk_size // 2, MIN_DOWNLOAD_CHUNK_SIZE)
+                    yield min(1.0, content_length_found / content_length)
+        except OSError:
+            log.warning(
+                f"Download of {url} failed on attempt {attempt + 1} of {attempts}.",
+                exc_info=True,
+            )
         if content_length == content_length_found:
             break
     else:
-        raise RuntimeError(f"Failed to download")
-    return b"".join(content)
+        raise RuntimeError(f"Failed to download {url}")
 
 
-def download_resources(path: str, version: str) -> None:
-    generator_unpacker(download_resources_iter(path, version))
+def download_with_retry(
+    url: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE, attempts: int = 5
+) -> Generator[float, None, bytes]:
+    """Download a file into memory. See :func:`download_to_file_with_retry`"""
+    with io.BytesIO() as f:
+        yield from download_to_file_with_retry(url, f, chunk_size, attempts)
+        return f.getvalue()
+
+
+def download_resources(
+    path: str, version: str, extract_all: Optional[bool] = None
+) -> None:
+    generator_unpacker(download_resources_iter(path, version, extract_all=extract_all))
 
 
 def download_resources_iter(
-    path: str, version: str, chunk_size: int = 4096
+    path: str,
+    version: str,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    extract_all: Optional[bool] = None,
 ) -> Generator[float, None, None]:
+    """Download the client jar for a version and extract the resource pack from it.
+
+    :param path: The directory to extract the resource pack to.
+    :param version: The version to download.
+    :param chunk_size: The initial read size of the download.
+    :param extract_all: Extract every file in assets. If False only the blockstates, models and textures
+        read by the resource pack manager are extracted. Defaults to EXTRACT_ALL_ASSETS.
+    """
+    if extract_all is None:
+        extract_all = EXTRACT_ALL_ASSETS
     log.info(f"Downloading Java resource pack for version {version}")
     version_url = next(
         (v["url"] for v in get_launcher_manifest()["versions"] if v["id"] == version),
@@ -170,38 +240,16 @@ def download_resources_iter(
             version_manifest = json.load(vm)
         version_client_url = version_manifest["downloads"]["client"]["url"]
 
-        downloader = download_with_retry(version_client_url)
-        try:
-            while True:
-                yield next(downloader) / 2
-        except StopIteration as e:
-            data = e.value
-
-        client = zipfile.ZipFile(io.BytesIO(data))
-        paths: list[str] = [
-            fpath for fpath in client.namelist() if fpath.startswith("assets/")
-        ]
-        path_count = len(paths)
-        for path_index, fpath in enumerate(paths):
-            if not path_index % 30:
-                yield path_index / (path_count * 2) + 0.5
-            if fpath.endswith("/"):
-                continue
-            os.makedirs(
-                os.path.dirname(os.path.abspath(os.path.join(path, fpath))),
-                exist_ok=True,
-            )
-            client.extract(fpath, path)
-        if "pack.mcmeta" in client.namelist():
-            client.extract("pack.mcmeta", path)
-        else:
-            # TODO: work out proper version support for this
-            with open(os.path.join(path, "pack.mcmeta"), "w") as f:
-                f.write(
-                    '{"pack": {"description": "The default data for Minecraft","pack_format": 7}}'
-                )
-        if "pack.png" in client.namelist():
-            client.extract("pack.png", path)
+        # download to a temporary file so that the jar is never held in memory
+        with tempfile.TemporaryFile() as client_file:
+            for progress in download_to_file_with_retry(
+                version_client_url, client_file, chunk_size
+            ):
+                yield progress / 2
+
+            client_file.seek(0)
+            with zipfile.ZipFile(client_file) as client:
+                yield from _extract_resources_iter(client, path, extract_all)
 
     except Exception as e:
         log.error(
@@ -210,3 +258,50 @@ def download_resources_iter(
         )
         raise e
     log.info(f"Finished downloading Java resource pack for version {version}")
+
+
+def _is_model_resource(fpath: str) -> bool:
+    """Is the file in the client jar read by the resource pack manager."""
+    parts = fpath.split("/")
+    if len(parts) < 4 or parts[0] != "assets":
+        return False
+    group = parts[2]
+    if group == "blockstates":
+        return len(parts) == 4 and fpath.endswith(".json")
+    elif group == "models":
+        return fpath.endswith(".json")
+    elif group == "textures":
+        return fpath.endswith(".png") and parts[3] not in UselessImageGroups
+    return False
+
+
+def _extract_resources_iter(
+    client: zipfile.ZipFile, path: str, extract_all: bool
+) -> Generator[float, None, None]:
+    """Extract the resource pack from the client jar. The progress is from 0.5 to 1."""
+    paths: list[str] = [
+        fpath
+        for fpath in client.namelist()
+        if fpath.startswith("assets/") and (extract_all or _is_model_resource(fpath))
+    ]
+    path_count = len(paths)
+    for path_index, fpath in enumerate(paths):
+        if not path_index % 30:
+            yield path_index / (path_count * 2) + 0.5
+        if fpath.endswith("/"):
+            continue
+        os.makedirs(
+            os.path.dirname(os.path.abspath(os.path.join(path, fpath))),
+            exist_ok=True,
+        )
+        client.extract(fpath, path)
+    if "pack.mcmeta" in client.namelist():
+        client.extract("pack.mcmeta", path)
+    else:
+        # TODO: work out proper version support for this
+        with open(os.path.join(path, "pack.mcmeta"), "w") as f:
+            f.write(
+                '{"pack": {"description": "The default data for Minecraft","pack_format": 7}}'
+            )
+    if "pack.png" in client.namelist():
+        client.extract("pack.png", path)
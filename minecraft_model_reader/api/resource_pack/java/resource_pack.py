@@ -2,20 +2,35 @@ import os
 import json
 
 from minecraft_model_reader.api.resource_pack.base import BaseResourcePack
+from minecraft_model_reader.api.archive import (
+    is_archive,
+    in_archive,
+    get_zip_index,
+    resource_isfile,
+    open_resource,
+)
 
 
 class JavaResourcePack(BaseResourcePack):
     """A class to hold the bare bones information about the resource pack.
     Holds the pack format, description and if the pack is valid.
-    This information can be used in a viewer to display the packs to the user."""
+    This information can be used in a viewer to display the packs to the user.
+    The pack may be a directory or a zip file (.zip or .jar)."""
 
     def __init__(self, resource_pack_path: str):
+        pack_in_archive = in_archive(resource_pack_path)
+        if pack_in_archive and is_archive(resource_pack_path):
+            # the pack may be in a directory within the archive
+            root = get_zip_index(resource_pack_path).find_root("pack.mcmeta")
+            if root:
+                resource_pack_path = os.path.join(resource_pack_path, root[:-1])
         super().__init__(resource_pack_path)
+        self._in_archive = pack_in_archive
         meta_path = os.path.join(resource_pack_path, "pack.mcmeta")
         self._pack_format = 0
-        if os.path.isfile(meta_path):
+        if resource_isfile(meta_path):
             try:
-                with open(meta_path) as f:
+                with open_resource(meta_path, "r") as f:
                     pack_mcmeta = json.load(f)
             except json.JSONDecodeError:
                 pass
@@ -28,11 +43,13 @@ class JavaResourcePack(BaseResourcePack):
                         self._valid_pack = True
 
         pack_icon_path = os.path.join(resource_pack_path, "pack.png")
-        if os.path.isfile(pack_icon_path):
+        if resource_isfile(pack_icon_path):
             self._pack_icon = pack_icon_path
 
     @staticmethod
     def is_valid(pack_path: str) -> bool:
+        if is_archive(pack_path):
+            return get_zip_index(pack_path).find_root("pack.mcmeta") is not None
         return os.path.isfile(os.path.join(pack_path, "pack.mcmeta"))
 
     def __repr__(self) -> str:
@@ -1,10 +1,16 @@
 import os
 import json
-import copy
-from typing import Union, Iterable, Iterator, Optional
-from PIL import Image
+import pickle
+import hashlib
+from typing import Union, Iterable, Iterator, Optional, Literal, NamedTuple
+from collections.abc import Container
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    as_completed,
+)
 import numpy
-import glob
 import itertools
 import logging
 
@@ -13,13 +19,28 @@ import amulet_nbt
 from minecraft_model_reader.api import Block
 from minecraft_model_reader.api.resource_pack import BaseResourcePackManager
 from minecraft_model_reader.api.resource_pack.java import JavaResourcePack
+from minecraft_model_reader.api.resource_pack.java.blockstate import (
+    VariantMatcher,
+    MultipartMatcher,
+)
 from minecraft_model_reader.api.mesh.block.block_mesh import (
     BlockMesh,
     FACE_KEYS,
+    FACE_KEY_ORDER,
     Transparency,
 )
-from minecraft_model_reader.api.mesh.util import rotate_3d
+from minecraft_model_reader.api.mesh.util import rotation_matrix_3d
+from minecraft_model_reader.api.archive import (
+    iter_archive_files,
+    resource_mtime,
+    open_resource,
+)
+from minecraft_model_reader.api.image.transparency import (
+    TextureTransparency,
+    get_texture_transparency,
+)
 from minecraft_model_reader.api.mesh.block.cube import (
+    unit_box_coordinates,
     cube_face_lut,
     uv_rotation_lut,
     tri_face,
@@ -39,6 +60,20 @@ UselessImageGroups = {
     "particle",
 }
 
+FaceDirections = tuple(cube_face_lut)
+# For each face direction, the corner (0 lower, 1 upper) each vertex uses on each axis.
+FaceCornerLUT = numpy.array(
+    [unit_box_coordinates[cube_face_lut[face_dir]] for face_dir in FaceDirections]
+)
+CullDirectionIndex = {cull_dir: index for index, cull_dir in enumerate(FACE_KEY_ORDER)}
+
+
+class PackFile(NamedTuple):
+    namespace: str
+    rel_path: str  # the path relative to the group directory without the extension
+    path: str
+    mtime: Optional[float]
+
 
 class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
     """A class to load and handle the data from the packs.
@@ -48,12 +83,63 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
         self,
         resource_packs: Union[JavaResourcePack, Iterable[JavaResourcePack]],
         load: bool = True,
+        texture_workers: int = 0,
+        texture_worker_mode: Literal["thread", "process"] = "thread",
+        persistent_cache: bool = False,
+        resolve_models: bool = False,
+        lazy_load: bool = False,
+        max_cached_models: Optional[int] = None,
+        max_cached_model_bytes: Optional[int] = None,
+        compact_models: bool = False,
     ) -> None:
-        super().__init__()
+        """
+        :param resource_packs: The resource packs to load. Later packs overwrite earlier ones.
+        :param load: Should the resource packs be loaded now.
+        :param texture_workers: The number of workers used to check texture transparency.
+            If 0 the textures are checked one at a time in the calling thread.
+        :param texture_worker_mode: Run the texture workers in a "thread" or "process" pool.
+        :param persistent_cache: Store the parsed blockstate and model files and the built block models on disk.
+            If none of the files have changed the next load will read them from the cache instead of parsing them.
+            The block models in the model cache are only stored when :meth:`save_model_cache` is called.
+        :param resolve_models: Resolve the parent chain of every model file when loading.
+            This makes loading slower but the first lookup of each block faster.
+        :param lazy_load: Only find the blockstate and model files when loading.
+            Each file is parsed the first time a block model needs it.
+        :param max_cached_models: The maximum number of block models to cache in memory. None for no limit.
+        :param max_cached_model_bytes: The maximum size of the arrays of the block models cached in memory.
+            None for no limit. The models of each blockstate variant and multipart case are cached
+            separately to build the block models and are not counted by :attr:`model_cache_info`.
+        :param compact_models: If True the block models use float32 vertices and texture coords,
+            uint8 tint and uint16 indexes where they fit.
+        """
+        super().__init__(max_cached_models, max_cached_model_bytes, compact_models)
+        if texture_workers < 0:
+            raise ValueError("texture_workers must be 0 or more")
+        if texture_worker_mode not in ("thread", "process"):
+            raise ValueError(f"Invalid texture worker mode {texture_worker_mode}")
+        self._texture_workers = texture_workers
+        self._texture_worker_mode = texture_worker_mode
+        # paths of the blockstate and model files that have not been parsed yet
+        self._blockstate_file_paths: dict[tuple[str, str], str] = {}
+        self._model_file_paths: dict[tuple[str, str], str] = {}
         self._blockstate_files: dict[tuple[str, str], dict] = {}
+        # compiled blockstate files. None if the file does not exist or is not valid
+        self._blockstates: dict[
+            tuple[str, str], Union[VariantMatcher, MultipartMatcher, None]
+        ] = {}
         self._textures: dict[tuple[str, str], str] = {}
-        self._texture_is_transparent: dict[str, tuple[float, bool]] = {}
+        self._texture_is_transparent: dict[str, tuple[float, int]] = {}
         self._model_files: dict[tuple[str, str], dict] = {}
+        self._lazy_load = lazy_load
+        self._persistent_cache = persistent_cache
+        self._resolve_models = resolve_models
+        # model files merged with their parents. See _recursive_load_block_model
+        self._resolved_models: dict[tuple[str, str], dict] = {}
+        # built block models stored under (model path, x rotation, y rotation, uvlock)
+        self._blockstate_models: dict[tuple[str, int, int, bool], BlockMesh] = {}
+        self._model_cache_key = ""
+        # block models loaded from the persistent cache that have not been used yet stored under the snbt blockstate
+        self._persistent_models: dict[str, BlockMesh] = {}
         if isinstance(resource_packs, Iterable):
             self._packs = list(resource_packs)
         elif isinstance(resource_packs, JavaResourcePack):
@@ -67,14 +153,257 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
     def _unload(self) -> None:
         """Clear all loaded resources."""
         super()._unload()
+        self._blockstate_file_paths.clear()
+        self._model_file_paths.clear()
         self._blockstate_files.clear()
+        self._blockstates.clear()
         self._textures.clear()
         self._texture_is_transparent.clear()
         self._model_files.clear()
+        self._resolved_models.clear()
+        self._blockstate_models.clear()
+        self._model_cache_key = ""
+        self._persistent_models.clear()
+
+    @property
+    def _model_cache_path(self) -> str:
+        """The path to the persistent cache file for this combination of resource packs."""
+        packs_hash = hashlib.sha1(
+            "\n".join(self.pack_paths).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(
+            os.environ["CACHE_DIR"],
+            "resource_packs",
+            "java",
+            "model_cache",
+            f"{packs_hash}.pickle",
+        )
+
+    @staticmethod
+    def _get_model_cache_key(files: Iterable[tuple[str, Optional[float]]]) -> str:
+        """Create a key from the library version and the modification times of the given files.
+
+        :param files: The file paths and their modification times. The time is found if it is None.
+        """
+        from minecraft_model_reader import __version__
+
+        key = hashlib.sha1(__version__.encode("utf-8"))
+        for path, mtime in sorted(files):
+            if mtime is None:
+                mtime = resource_mtime(path)
+            key.update(f"\n{path}:{mtime}".encode("utf-8"))
+        return key.hexdigest()
+
+    def _load_model_cache(self) -> bool:
+        """Load the persistent cache if it is enabled and matches the current files.
+
+        :return: True if the cache was loaded.
+        """
+        if not self._persistent_cache or not self._model_cache_key:
+            return False
+        try:
+            with open(self._model_cache_path, "rb") as f:
+                cache = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception:
+            log.warning(
+                f"Failed to load model cache {self._model_cache_path}", exc_info=True
+            )
+            return False
+        if not isinstance(cache, dict) or cache.get("key") != self._model_cache_key:
+            return False
+        self._blockstate_files = cache["blockstates"]
+        self._model_files = cache["models"]
+        if cache.get("compact_models") == self._compact_models:
+            self._persistent_models = cache["block_models"]
+        return True
+
+    def save_model_cache(self) -> None:
+        """Write the parsed files and the block models in the model cache to the persistent cache.
+        Models loaded from the persistent cache that have not been used yet are also written.
+        The number and size of the models written are limited by max_cached_models and max_cached_model_bytes.
+        This does nothing if the persistent cache is not enabled."""
+        if not self._persistent_cache or not self._model_cache_key:
+            return
+        cache_info = self._cached_models.info
+        block_models: dict[str, BlockMesh] = {}
+        model_ids: set[int] = set()
+        nbytes = 0
+        # the most recently used models are kept first
+        for key, model in itertools.chain(
+            (
+                (block.snbt_blockstate, model)
+                for block, model in reversed(self._cached_models.items())
+                if not block.extra_blocks
+            ),
+            self._persistent_models.items(),
+        ):
+            if (
+                cache_info.max_entries is not None
+                and len(block_models) >= cache_info.max_entries
+            ):
+                break
+            if id(model) not in model_ids:
+                if (
+                    cache_info.max_bytes is not None
+                    and nbytes + model.nbytes > cache_info.max_bytes
+                ):
+                    break
+                model_ids.add(id(model))
+                nbytes += model.nbytes
+            block_models.setdefault(key, model)
+        path = self._model_cache_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file and replace so that other processes never read a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(
+                {
+                    "key": self._model_cache_key,
+                    "blockstates": self._blockstate_files,
+                    "models": self._model_files,
+                    "compact_models": self._compact_models,
+                    "block_models": block_models,
+                },
+                f,
+                pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temp_path, path)
+
+    def _create_texture_executor(self) -> Executor:
+        if self._texture_worker_mode == "process":
+            return ProcessPoolExecutor(self._texture_workers)
+        else:
+            return ThreadPoolExecutor(self._texture_workers)
+
+    @staticmethod
+    def _check_textures(
+        textures: list[tuple[str, float]], executor: Optional[Executor]
+    ) -> Iterator[tuple[str, tuple[float, TextureTransparency]]]:
+        """Check the transparency of the given textures.
+        If an executor is given the textures are checked in parallel and yielded in the order they complete.
+
+        :param textures: The texture paths and their modification times.
+        :param executor: The executor to check the textures with or None to check them in this thread.
+        :return: The texture paths and their modification times and transparency.
+        """
+        if executor is None:
+            for texture_path, mtime in textures:
+                yield texture_path, (mtime, get_texture_transparency(texture_path))
+        else:
+            futures = {
+                executor.submit(get_texture_transparency, texture_path): (
+                    texture_path,
+                    mtime,
+                )
+                for texture_path, mtime in textures
+            }
+            for future in as_completed(futures):
+                texture_path, mtime = futures[future]
+                yield texture_path, (mtime, future.result())
+
+    @staticmethod
+    def _scan_pack(
+        root_dir: str, archive: bool, stat_json: bool
+    ) -> tuple[list[PackFile], list[PackFile], list[PackFile]]:
+        """Find the textures, blockstate files and model files of a pack in one pass over its files.
+
+        :param root_dir: The root directory of the pack.
+        :param archive: Is the pack in a zip file.
+        :param stat_json: Find the modification time of the blockstate and model files. Textures always have it.
+        :return: The textures, blockstate files and model files.
+        """
+        textures: list[PackFile] = []
+        blockstates: list[PackFile] = []
+        models: list[PackFile] = []
+        # group directory -> (files, extension, recursive, top level directories to skip)
+        groups: dict[str, tuple[list[PackFile], str, bool, Container[str]]] = {
+            "textures": (textures, ".png", True, UselessImageGroups),
+            "blockstates": (blockstates, ".json", False, ()),
+            "models": (models, ".json", True, ()),
+        }
+
+        if archive:
+            archive_mtime = resource_mtime(root_dir)
+            for path in iter_archive_files(root_dir):
+                parts = os.path.relpath(path, root_dir).split(os.sep)
+                if len(parts) >= 4 and parts[0] == "assets" and parts[2] in groups:
+                    files, extension, recursive, skip_dirs = groups[parts[2]]
+                    if (
+                        parts[-1].endswith(extension)
+                        and (recursive or len(parts) == 4)
+                        and not (len(parts) > 4 and parts[3] in skip_dirs)
+                    ):
+                        rel_path = "/".join(parts[3:])[: -len(extension)]
+                        files.append(PackFile(parts[1], rel_path, path, archive_mtime))
+            return textures, blockstates, models
+
+        def scan_dir(
+            path: str,
+            rel_path: str,
+            extension: str,
+            recursive: bool,
+            skip_dirs: Container[str],
+            stat: bool,
+        ) -> Iterator[tuple[str, str, Optional[float]]]:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_file():
+                        # match the extension like the file system does. Eg. case insensitive on Windows
+                        if os.path.normcase(entry.name).endswith(extension):
+                            yield (
+                                f"{rel_path}{entry.name[: -len(extension)]}",
+                                entry.path,
+                                entry.stat().st_mtime if stat else None,
+                            )
+                    elif (
+                        recursive
+                        and entry.is_dir()
+                        and not (not rel_path and entry.name in skip_dirs)
+                    ):
+                        yield from scan_dir(
+                            entry.path,
+                            f"{rel_path}{entry.name}/",
+                            extension,
+                            recursive,
+                            skip_dirs,
+                            stat,
+                        )
+
+        try:
+            namespace_entries = list(os.scandir(os.path.join(root_dir, "assets")))
+        except OSError:
+            return textures, blockstates, models
+        for namespace_entry in namespace_entries:
+            if namespace_entry.name.startswith(".") or not namespace_entry.is_dir():
+                continue
+            with os.scandir(namespace_entry.path) as it:
+                group_entries = [
+                    (os.path.normcase(entry.name), entry)
+                    for entry in it
+                    if os.path.normcase(entry.name) in groups and entry.is_dir()
+                ]
+            for group_name, group_entry in group_entries:
+                files, extension, recursive, skip_dirs = groups[group_name]
+                for rel_path, path, mtime in scan_dir(
+                    group_entry.path,
+                    "",
+                    extension,
+                    recursive,
+                    skip_dirs,
+                    stat_json or group_name == "textures",
+                ):
+                    files.append(PackFile(namespace_entry.name, rel_path, path, mtime))
+        return textures, blockstates, models
 
     def _load_iter(self) -> Iterator[float]:
-        blockstate_file_paths: dict[tuple[str, str], str] = {}
-        model_file_paths: dict[tuple[str, str], str] = {}
+        blockstate_file_paths = self._blockstate_file_paths
+        model_file_paths = self._model_file_paths
+        # the modification times found when scanning the packs
+        file_mtimes: dict[str, Optional[float]] = {}
 
         transparency_cache_path = os.path.join(
             os.environ["CACHE_DIR"], "resource_packs", "java", "transparency_cache.json"
@@ -85,123 +414,130 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
 
         pack_count = len(self._packs)
 
-        for pack_index, pack in enumerate(self._packs):
-            # pack_format=2 textures/blocks, textures/items - case sensitive
-            # pack_format=3 textures/blocks, textures/items - lower case
-            # pack_format=4 textures/block, textures/item
-            # pack_format=5 model paths and texture paths are now optionally namespaced
-
-            pack_progress = pack_index / pack_count
-            yield pack_progress
-
-            if pack.valid_pack and pack.pack_format >= 2:
-                image_paths = glob.glob(
-                    os.path.join(
-                        glob.escape(pack.root_dir),
-                        "assets",
-                        "*",  # namespace
-                        "textures",
-                        "**",
-                        "*.png",
-                    ),
-                    recursive=True,
-                )
-                image_count = len(image_paths)
-                sub_progress = pack_progress
-                for image_index, texture_path in enumerate(image_paths):
-                    _, namespace, _, *rel_path_list = os.path.normpath(
-                        os.path.relpath(texture_path, pack.root_dir)
-                    ).split(os.sep)
-                    if rel_path_list[0] not in UselessImageGroups:
-                        rel_path = "/".join(rel_path_list)[:-4]
-                        self._textures[(namespace, rel_path)] = texture_path
+        executor: Optional[Executor] = None
+        try:
+            for pack_index, pack in enumerate(self._packs):
+                # pack_format=2 textures/blocks, textures/items - case sensitive
+                # pack_format=3 textures/blocks, textures/items - lower case
+                # pack_format=4 textures/block, textures/item
+                # pack_format=5 model paths and texture paths are now optionally namespaced
+
+                pack_progress = pack_index / pack_count
+                yield pack_progress
+
+                if pack.valid_pack and pack.pack_format >= 2:
+                    texture_files, blockstate_files, model_files = self._scan_pack(
+                        pack.root_dir, pack.in_archive, self._persistent_cache
+                    )
+                    image_count = len(texture_files)
+                    sub_progress = pack_progress
+                    stale_textures: list[tuple[str, float]] = []
+                    for texture_file in texture_files:
+                        texture_path = texture_file.path
+                        self._textures[
+                            (texture_file.namespace, texture_file.rel_path)
+                        ] = texture_path
+                        texture_mtime = texture_file.mtime
+                        if texture_mtime is None:
+                            texture_mtime = resource_mtime(texture_path)
+                        file_mtimes[texture_path] = texture_mtime
                         if (
-                            os.stat(texture_path).st_mtime
+                            texture_mtime
                             != self._texture_is_transparent.get(texture_path, [0])[0]
                         ):
-                            im: Image.Image = Image.open(texture_path)
-                            if im.mode == "RGBA":
-                                alpha = numpy.array(im.getchannel("A").getdata())
-                                texture_is_transparent = bool(numpy.any(alpha != 255))
-                            else:
-                                texture_is_transparent = False
-
-                            self._texture_is_transparent[texture_path] = (
-                                os.stat(texture_path).st_mtime,
-                                texture_is_transparent,
-                            )
-                    yield sub_progress + image_index / (image_count * pack_count * 3)
-
-                blockstate_paths = glob.glob(
-                    os.path.join(
-                        glob.escape(pack.root_dir),
-                        "assets",
-                        "*",  # namespace
-                        "blockstates",
-                        "*.json",
-                    )
-                )
-                blockstate_count = len(blockstate_paths)
-                sub_progress = pack_progress + 1 / (pack_count * 3)
-                for blockstate_index, blockstate_path in enumerate(blockstate_paths):
-                    _, namespace, _, blockstate_file = os.path.normpath(
-                        os.path.relpath(blockstate_path, pack.root_dir)
-                    ).split(os.sep)
-                    blockstate_file_paths[(namespace, blockstate_file[:-5])] = (
-                        blockstate_path
-                    )
-                    yield sub_progress + (blockstate_index) / (
-                        blockstate_count * pack_count * 3
-                    )
+                            stale_textures.append((texture_path, texture_mtime))
+
+                    if stale_textures and self._texture_workers and executor is None:
+                        # the workers are shared by all the packs
+                        executor = self._create_texture_executor()
+                    # textures that did not need checking count towards the progress straight away
+                    for image_index, (texture_path, transparency) in enumerate(
+                        self._check_textures(stale_textures, executor),
+                        image_count - len(stale_textures),
+                    ):
+                        self._texture_is_transparent[texture_path] = transparency
+                        yield sub_progress + image_index / (
+                            image_count * pack_count * 3
+                        )
 
-                model_paths = glob.glob(
-                    os.path.join(
-                        glob.escape(pack.root_dir),
-                        "assets",
-                        "*",  # namespace
-                        "models",
-                        "**",
-                        "*.json",
-                    ),
-                    recursive=True,
-                )
-                model_count = len(model_paths)
-                sub_progress = pack_progress + 2 / (pack_count * 3)
-                for model_index, model_path in enumerate(model_paths):
-                    _, namespace, _, *rel_path_list = os.path.normpath(
-                        os.path.relpath(model_path, pack.root_dir)
-                    ).split(os.sep)
-                    rel_path = "/".join(rel_path_list)[:-5]
-                    model_file_paths[(namespace, rel_path.replace(os.sep, "/"))] = (
-                        model_path
-                    )
-                    yield sub_progress + (model_index) / (model_count * pack_count * 3)
+                    blockstate_count = len(blockstate_files)
+                    sub_progress = pack_progress + 1 / (pack_count * 3)
+                    for blockstate_index, blockstate_file in enumerate(
+                        blockstate_files
+                    ):
+                        blockstate_file_paths[
+                            (blockstate_file.namespace, blockstate_file.rel_path)
+                        ] = blockstate_file.path
+                        file_mtimes[blockstate_file.path] = blockstate_file.mtime
+                        yield sub_progress + (blockstate_index) / (
+                            blockstate_count * pack_count * 3
+                        )
+
+                    model_count = len(model_files)
+                    sub_progress = pack_progress + 2 / (pack_count * 3)
+                    for model_index, model_file in enumerate(model_files):
+                        model_file_paths[
+                            (model_file.namespace, model_file.rel_path)
+                        ] = model_file.path
+                        file_mtimes[model_file.path] = model_file.mtime
+                        yield sub_progress + (model_index) / (
+                            model_count * pack_count * 3
+                        )
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
         os.makedirs(os.path.dirname(transparency_cache_path), exist_ok=True)
         with open(transparency_cache_path, "w") as f:
             json.dump(self._texture_is_transparent, f)
 
-        for key, path in blockstate_file_paths.items():
-            with open(path) as fi:
-                try:
-                    self._blockstate_files[key] = json.load(fi)
-                except json.JSONDecodeError:
-                    log.error(f"Failed to parse blockstate file {path}")
+        if self._persistent_cache:
+            self._model_cache_key = self._get_model_cache_key(
+                (path, file_mtimes.get(path))
+                for path in itertools.chain(
+                    self._textures.values(),
+                    blockstate_file_paths.values(),
+                    model_file_paths.values(),
+                )
+            )
 
-        for key, path in model_file_paths.items():
-            with open(path) as fi:
+        if self._load_model_cache():
+            # these have been parsed already
+            for key in self._blockstate_files:
+                blockstate_file_paths.pop(key, None)
+            for key in self._model_files:
+                model_file_paths.pop(key, None)
+
+        if not self._lazy_load:
+            if blockstate_file_paths or model_file_paths:
+                # parse the files not in the persistent cache
+                for key in list(blockstate_file_paths):
+                    self._get_blockstate_file(key)
+                for key in list(model_file_paths):
+                    self._get_model_file(key)
+                self.save_model_cache()
+
+            for key in list(self._blockstate_files):
+                self._get_blockstate(key)
+
+        if self._resolve_models:
+            for namespace, model_path in [*self._model_files, *model_file_paths]:
                 try:
-                    self._model_files[key] = json.load(fi)
-                except json.JSONDecodeError:
-                    log.error(f"Failed to parse model file file {path}")
+                    self._recursive_load_block_model(f"{namespace}:{model_path}")
+                except Exception as e:
+                    log.error(f"Failed to resolve model {namespace}:{model_path}\n{e}")
 
     @property
     def textures(self) -> tuple[str, ...]:
-        """Returns a tuple of all the texture paths in the resource pack."""
+        """Returns a tuple of all the texture paths in the resource pack.
+        Textures from zip packs are not on the file system. Use :meth:`open_texture` to read them.
+        """
         return tuple(self._textures.values())
 
     def get_texture_path(self, namespace: Optional[str], relative_path: str) -> str:
-        """Get the absolute texture path from the namespace and relative path pair"""
+        """Get the absolute texture path from the namespace and relative path pair.
+        Textures from zip packs are not on the file system. Use :meth:`open_texture` to read them.
+        """
         if namespace is None:
             return self.missing_no
         key = (namespace, relative_path)
@@ -210,6 +546,59 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
         else:
             return self.missing_no
 
+    @staticmethod
+    def _load_json(path: str, file_type: str) -> Optional[dict]:
+        with open_resource(path, "r") as fi:
+            try:
+                data: dict = json.load(fi)
+            except json.JSONDecodeError:
+                log.error(f"Failed to parse {file_type} file {path}")
+                return None
+        return data
+
+    def _get_blockstate_file(self, key: tuple[str, str]) -> Optional[dict]:
+        """Get the data from a blockstate file, parsing it if it has not been parsed yet."""
+        # The path is removed after the data is stored so another thread either parses it too or finds the data.
+        path = self._blockstate_file_paths.get(key)
+        if path is not None:
+            blockstate = self._load_json(path, "blockstate")
+            if blockstate is not None:
+                self._blockstate_files[key] = blockstate
+            self._blockstate_file_paths.pop(key, None)
+        return self._blockstate_files.get(key)
+
+    def _get_model_file(self, key: tuple[str, str]) -> Optional[dict]:
+        """Get the data from a model file, parsing it if it has not been parsed yet."""
+        path = self._model_file_paths.get(key)
+        if path is not None:
+            model = self._load_json(path, "model")
+            if model is not None:
+                self._model_files[key] = model
+            self._model_file_paths.pop(key, None)
+        return self._model_files.get(key)
+
+    def _get_blockstate(
+        self, key: tuple[str, str]
+    ) -> Union[VariantMatcher, MultipartMatcher, None]:
+        """Get the compiled blockstate file, compiling it if it has not been compiled yet."""
+        if key in self._blockstates:
+            return self._blockstates[key]
+        matcher = self._compile_blockstate(self._get_blockstate_file(key))
+        self._blockstates[key] = matcher
+        return matcher
+
+    @staticmethod
+    def _compile_blockstate(
+        blockstate: Optional[dict],
+    ) -> Union[VariantMatcher, MultipartMatcher, None]:
+        """Compile the blockstate file data so that models can be found without parsing it again."""
+        if isinstance(blockstate, dict):
+            if isinstance(blockstate.get("variants"), dict):
+                return VariantMatcher(blockstate["variants"])
+            elif isinstance(blockstate.get("multipart"), list):
+                return MultipartMatcher(blockstate["multipart"])
+        return None
+
     @staticmethod
     def parse_state_val(val: Union[str, bool]) -> list:
         """Convert the json block state format into a consistent format."""
@@ -224,87 +613,37 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
 
     def _get_model(self, block: Block) -> BlockMesh:
         """Find the model paths for a given block state and load them."""
-        if (block.namespace, block.base_name) in self._blockstate_files:
-            blockstate: dict = self._blockstate_files[
-                (block.namespace, block.base_name)
-            ]
-            if "variants" in blockstate:
-                for variant in blockstate["variants"]:
-                    if variant == "":
-                        try:
-                            return self._load_blockstate_model(
-                                blockstate["variants"][variant]
-                            )
-                        except Exception as e:
-                            log.error(
-                                f"Failed to load block model {blockstate['variants'][variant]}\n{e}"
-                            )
-                    else:
-                        properties_match = Block.properties_regex.finditer(
-                            f",{variant}"
-                        )
-                        if all(
-                            block.properties.get(
-                                match.group("name"),
-                                amulet_nbt.TAG_String(match.group("value")),
-                            ).py_data
-                            == match.group("value")
-                            for match in properties_match
-                        ):
-                            try:
-                                return self._load_blockstate_model(
-                                    blockstate["variants"][variant]
-                                )
-                            except Exception as e:
-                                log.error(
-                                    f"Failed to load block model {blockstate['variants'][variant]}\n{e}"
-                                )
-
-            elif "multipart" in blockstate:
-                models = []
-
-                for case in blockstate["multipart"]:
+        if self._persistent_models:
+            # The model is moved to the model cache which decides how long to keep it.
+            model = self._persistent_models.pop(block.snbt_blockstate, None)
+            if model is not None:
+                return model
+        return self._build_block_model(block)
+
+    def _build_block_model(self, block: Block) -> BlockMesh:
+        """Find the model paths for a given block state and load them."""
+        matcher = self._get_blockstate((block.namespace, block.base_name))
+        if matcher is not None:
+            properties = {
+                name: value.py_data for name, value in block.properties.items()
+            }
+            if isinstance(matcher, VariantMatcher):
+                for variant in matcher.find(properties):
                     try:
-                        if "when" in case:
-                            if "OR" in case["when"]:
-                                if not any(
-                                    all(
-                                        block.properties.get(prop, None)
-                                        in self.parse_state_val(val)
-                                        for prop, val in prop_match.items()
-                                    )
-                                    for prop_match in case["when"]["OR"]
-                                ):
-                                    continue
-                            elif "AND" in case["when"]:
-                                if not all(
-                                    all(
-                                        block.properties.get(prop, None)
-                                        in self.parse_state_val(val)
-                                        for prop, val in prop_match.items()
-                                    )
-                                    for prop_match in case["when"]["AND"]
-                                ):
-                                    continue
-                            elif not all(
-                                block.properties.get(prop, None)
-                                in self.parse_state_val(val)
-                                for prop, val in case["when"].items()
-                            ):
-                                continue
-
-                        if "apply" in case:
-                            try:
-                                models.append(
-                                    self._load_blockstate_model(case["apply"])
-                                )
-
-                            except Exception as e:
-                                log.error(
-                                    f"Failed to load block model {case['apply']}\n{e}"
-                                )
+                        return self._load_blockstate_model(variant)
                     except Exception as e:
-                        log.error(f"Failed to parse block state for {block}\n{e}")
+                        log.error(f"Failed to load block model {variant}\n{e}")
+
+            elif isinstance(matcher, MultipartMatcher):
+                models = []
+                for case in matcher.find(properties):
+                    if case.model is None:
+                        try:
+                            case.model = self._load_blockstate_model(case.apply)
+                        except Exception as e:
+                            log.error(f"Failed to load block model {case.apply}\n{e}")
+                            continue
+                    models.append(case.model)
 
                 return BlockMesh.merge(models)
 
@@ -321,47 +660,58 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
         model_path = blockstate_value["model"]
         rotx = int(blockstate_value.get("x", 0) // 90)
         roty = int(blockstate_value.get("y", 0) // 90)
-        uvlock = blockstate_value.get("uvlock", False)
-
-        model = copy.deepcopy(self._load_block_model(model_path))
-
-        # TODO: rotate model based on uv_lock
-        return model.rotate(rotx, roty)
+        uvlock = bool(blockstate_value.get("uvlock", False))
+
+        # The models are immutable so each model and rotation only needs building once.
+        key = (model_path, rotx, roty, uvlock)
+        model = self._blockstate_models.get(key)
+        if model is None:
+            if rotx or roty:
+                base_key = (model_path, 0, 0, uvlock)
+                base_model = self._blockstate_models.get(base_key)
+                if base_model is None:
+                    base_model = self._blockstate_models[base_key] = (
+                        self._load_block_model(model_path)
+                    )
+                # TODO: rotate model based on uv_lock
+                model = base_model.rotate(rotx, roty)
+            else:
+                model = self._load_block_model(model_path)
+            self._blockstate_models[key] = model
+        return model
 
     def _load_block_model(self, model_path: str) -> BlockMesh:
         """Load the model file associated with the Block and convert to a BlockMesh."""
         # recursively load model files into one dictionary
         java_model = self._recursive_load_block_model(model_path)
 
-        # set up some variables
-        texture_dict = {}
-        textures = []
-        texture_count = 0
-        vert_count = {side: 0 for side in FACE_KEYS}
-        verts_src: dict[Optional[str], list[numpy.ndarray]] = {
-            side: [] for side in FACE_KEYS
-        }
-        tverts_src: dict[Optional[str], list[numpy.ndarray]] = {
-            side: [] for side in FACE_KEYS
-        }
-        tint_verts_src: dict[Optional[str], list[float]] = {
-            side: [] for side in FACE_KEYS
-        }
-        faces_src: dict[Optional[str], list[numpy.ndarray]] = {
-            side: [] for side in FACE_KEYS
-        }
-
-        texture_indexes_src: dict[Optional[str], list[int]] = {
-            side: [] for side in FACE_KEYS
-        }
-        transparent = Transparency.Partial
-
         if set(java_model.get("textures", {})).difference(
             {"particle"}
         ) and not java_model.get("elements"):
             return self.missing_block
 
-        for element in java_model.get("elements", {}):
+        # set up some variables
+        texture_dict: dict[str, int] = {}
+        textures: list[str] = []
+        transparent = Transparency.Partial
+
+        # The upper and lower corners of each element
+        element_corners: list[list] = []
+        # The index of each rotated element, its rotation angles and origin
+        rotated_elements: list[int] = []
+        rotation_angles: list[list[float]] = []
+        rotation_origins: list[list[float]] = []
+
+        # The data for each face. The geometry is computed for all faces at once below.
+        face_elements: list[int] = []
+        face_directions: list[int] = []
+        face_cull_directions: list[int] = []
+        face_uvs: list[list[float]] = []
+        face_uv_slices: list[list[int]] = []
+        face_tints: list[bool] = []
+        face_texture_indexes: list[int] = []
+
+        for element_index, element in enumerate(java_model.get("elements", {})):
             # iterate through elements (one cube per element)
             element_faces = element.get("faces", {})
 
@@ -381,20 +731,24 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
             else:
                 check_faces = False
 
-            # lower and upper box coordinates
-            corners = numpy.sort(
-                numpy.array(
-                    [element.get("to", [16, 16, 16]), element.get("from", [0, 0, 0])],
-                    float,
-                )
-                / 16,
-                0,
+            element_corners.append(
+                [element.get("to", [16, 16, 16]), element.get("from", [0, 0, 0])]
             )
 
-            # vertex coordinates of the box
-            box_coordinates = numpy.array(
-                list(itertools.product(corners[:, 0], corners[:, 1], corners[:, 2]))
-            )
+            if "rotation" in element:
+                rotation = element["rotation"]
+                angle = rotation.get("angle", 0)
+                axis = rotation.get("axis", "x")
+                angles = [0.0, 0.0, 0.0]
+                if axis == "x":
+                    angles[0] = -angle
+                elif axis == "y":
+                    angles[1] = -angle
+                elif axis == "z":
+                    angles[2] = -angle
+                rotated_elements.append(element_index)
+                rotation_angles.append(angles)
+                rotation_origins.append(rotation.get("origin", [8, 8, 8]))
 
             for face_dir in element_faces:
                 if face_dir in cube_face_lut:
@@ -422,75 +776,33 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
                     )
 
                     if check_faces:
-                        if self._texture_is_transparent[texture_path][1]:
+                        if self.get_texture_transparency(texture_path):
                             check_faces = False
                         else:
                             opaque_face_count += 1
 
                     # get the texture
                     if texture_relative_path not in texture_dict:
-                        texture_dict[texture_relative_path] = texture_count
+                        texture_dict[texture_relative_path] = len(textures)
                         textures.append(texture_path)
-                        texture_count += 1
-
-                    # texture index for the face
-                    texture_index = texture_dict[texture_relative_path]
 
                     # get the uv values for each vertex
                     # TODO: get the uv based on box location if not defined
-                    texture_uv = (
-                        numpy.array(
-                            element_faces[face_dir].get("uv", [0, 0, 16, 16]),
-                            float,
-                        )
-                        / 16
-                    )
                     texture_rotation = element_faces[face_dir].get("rotation", 0)
-                    uv_slice = (
-                        uv_rotation_lut[2 * int(texture_rotation / 90) :]
-                        + uv_rotation_lut[: 2 * int(texture_rotation / 90)]
-                    )
+                    uv_shift = 2 * int(texture_rotation / 90)
 
-                    # merge the vertex coordinates and texture coordinates
-                    face_verts = box_coordinates[cube_face_lut[face_dir]]
-                    if "rotation" in element:
-                        rotation = element["rotation"]
-                        origin = [r / 16 for r in rotation.get("origin", [8, 8, 8])]
-                        angle = rotation.get("angle", 0)
-                        axis = rotation.get("axis", "x")
-                        angles = [0, 0, 0]
-                        if axis == "x":
-                            angles[0] = -angle
-                        elif axis == "y":
-                            angles[1] = -angle
-                        elif axis == "z":
-                            angles[2] = -angle
-                        face_verts = rotate_3d(face_verts, *angles, *origin)
-
-                    verts_src[cull_dir].append(
-                        face_verts
-                    )  # vertex coordinates for this face
-
-                    tverts_src[cull_dir].append(
-                        texture_uv[uv_slice].reshape((-1, 2))  # texture vertices
+                    face_elements.append(element_index)
+                    face_directions.append(FaceDirections.index(face_dir))
+                    face_cull_directions.append(CullDirectionIndex[cull_dir])
+                    face_uvs.append(
+                        element_faces[face_dir].get("uv", [0, 0, 16, 16])[:4]
                     )
-                    if "tintindex" in element_faces[face_dir]:
-                        tint_verts_src[cull_dir] += [
-                            0,
-                            1,
-                            0,
-                        ] * 4  # TODO: set this up for each supported block
-                    else:
-                        tint_verts_src[cull_dir] += [1, 1, 1] * 4
-
-                    # merge the face indexes and texture index
-                    face_table = tri_face + vert_count[cull_dir]
-                    texture_indexes_src[cull_dir] += [texture_index, texture_index]
-
-                    # faces stored under cull direction because this is the criteria to render them or not
-                    faces_src[cull_dir].append(face_table)
-
-                    vert_count[cull_dir] += 4
+                    face_uv_slices.append(
+                        uv_rotation_lut[uv_shift:] + uv_rotation_lut[:uv_shift]
+                    )
+                    # TODO: set this up for each supported block
+                    face_tints.append("tintindex" in element_faces[face_dir])
+                    face_texture_indexes.append(texture_dict[texture_relative_path])
 
             if opaque_face_count == 6:
                 transparent = Transparency.FullOpaque
@@ -501,20 +813,78 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
         faces: dict[Optional[str], numpy.ndarray] = {}
         texture_indexes: dict[Optional[str], numpy.ndarray] = {}
 
-        for cull_dir in FACE_KEYS:
-            face_array = faces_src[cull_dir]
-            if len(face_array) > 0:
-                faces[cull_dir] = numpy.concatenate(face_array, axis=None)
-                tint_verts[cull_dir] = numpy.concatenate(
-                    tint_verts_src[cull_dir], axis=None
+        if face_elements:
+            face_element_array = numpy.array(face_elements)
+
+            # lower and upper box coordinates of each element. Shape (element, 2, 3)
+            corners = numpy.sort(numpy.array(element_corners, float) / 16, 1)
+
+            # vertex coordinates of each face. Shape (face, 4, 3)
+            face_verts = numpy.take_along_axis(
+                corners[face_element_array],
+                FaceCornerLUT[face_directions],
+                1,
+            )
+
+            if rotated_elements:
+                # the index into the rotation arrays for each element. -1 if not rotated
+                element_rotation = numpy.full(len(element_corners), -1)
+                element_rotation[rotated_elements] = numpy.arange(len(rotated_elements))
+                face_rotation = element_rotation[face_element_array]
+                rotated_faces = face_rotation != -1
+                face_rotation = face_rotation[rotated_faces]
+                origins = (
+                    numpy.array(rotation_origins, float)[face_rotation, numpy.newaxis]
+                    / 16
                 )
-                verts[cull_dir] = numpy.concatenate(verts_src[cull_dir], axis=None)
-                tverts[cull_dir] = numpy.concatenate(tverts_src[cull_dir], axis=None)
-                texture_indexes[cull_dir] = numpy.array(
-                    texture_indexes_src[cull_dir], dtype=numpy.uint32
+                matrices = rotation_matrix_3d(numpy.array(rotation_angles, float))
+                face_verts[rotated_faces] = (
+                    numpy.matmul(
+                        face_verts[rotated_faces] - origins, matrices[face_rotation]
+                    )
+                    + origins
                 )
 
-        return BlockMesh(
+            # texture vertices. Shape (face, 8)
+            face_tverts = numpy.take_along_axis(
+                numpy.array(face_uvs, float) / 16,
+                numpy.array(face_uv_slices),
+                1,
+            )
+
+            face_tint_verts = numpy.where(
+                numpy.array(face_tints)[:, numpy.newaxis],
+                numpy.array([0, 1, 0] * 4),
+                numpy.array([1, 1, 1] * 4),
+            )
+
+            face_texture_index_array = numpy.array(
+                face_texture_indexes, dtype=numpy.uint32
+            )
+
+            # faces stored under cull direction because this is the criteria to render them or not
+            cull_directions = numpy.array(face_cull_directions)
+            order = numpy.argsort(cull_directions, kind="stable")
+            counts = numpy.bincount(cull_directions, minlength=len(FACE_KEY_ORDER))
+            start = 0
+            for cull_dir, count in zip(FACE_KEY_ORDER, counts.tolist()):
+                if count:
+                    cull_faces = order[start : start + count]
+                    start += count
+                    verts[cull_dir] = face_verts[cull_faces].ravel()
+                    tverts[cull_dir] = face_tverts[cull_faces].ravel()
+                    tint_verts[cull_dir] = face_tint_verts[cull_faces].ravel()
+                    faces[cull_dir] = (
+                        tri_face
+                        + numpy.arange(0, 4 * count, 4, dtype=numpy.uint32)[
+                            :, numpy.newaxis
+                        ]
+                    ).ravel()
+                    texture_indexes[cull_dir] = numpy.repeat(
+                        face_texture_index_array[cull_faces], 2
+                    )
+
+        model = BlockMesh(
             3,
             verts,
             tverts,
@@ -524,26 +894,39 @@ class JavaResourcePackManager(BaseResourcePackManager[JavaResourcePack]):
             tuple(textures),
             transparent,
         )
+        if self._compact_models:
+            # compact before caching so the rotated and merged models are built from the compact arrays
+            model = model.compact()
+        return model
 
     def _recursive_load_block_model(self, model_path: str) -> dict:
-        """Load a model json file and recursively load and merge the parent entries into one json file."""
+        """Load a model json file and recursively load and merge the parent entries into one json file.
+        The result is cached so it must not be modified."""
         model_path_list = model_path.split(":", 1)
         if len(model_path_list) == 2:
             namespace, model_path = model_path_list
         else:
             namespace = "minecraft"
-        if (namespace, model_path) in self._model_files:
-            model = self._model_files[(namespace, model_path)]
-
+        key = (namespace, model_path)
+        resolved_model = self._resolved_models.get(key)
+        if resolved_model is None:
+            resolved_model = self._resolved_models[key] = self._resolve_block_model(key)
+        return resolved_model
+
+    def _resolve_block_model(self, key: tuple[str, str]) -> dict:
+        """Merge a model with its resolved parent model."""
+        model = self._get_model_file(key)
+        if model is not None:
             if "parent" in model:
-                parent_model = self._recursive_load_block_model(model["parent"])
+                # copy so that the cached parent is not modified
+                parent_model = dict(self._recursive_load_block_model(model["parent"]))
             else:
                 parent_model = {}
             if "textures" in model:
-                if "textures" not in parent_model:
-                    parent_model["textures"] = {}
-                for key, val in model["textures"].items():
-                    parent_model["textures"][key] = val
+                parent_model["textures"] = {
+                    **parent_model.get("textures", {}),
+                    **model["textures"],
+                }
             if "elements" in model:
                 parent_model["elements"] = model["elements"]
 
@@ -0,0 +1,45 @@
+import timeit
+
+from minecraft_model_reader.api import Block
+
+Repeats = 5
+Lookups = 100_000
+
+
+def main():
+    states = [
+        "minecraft:stone",
+        "minecraft:oak_log[axis=y]",
+        "minecraft:oak_stairs[facing=north,half=bottom,shape=straight,waterlogged=false]",
+        "minecraft:oak_fence[east=true,north=false,south=true,waterlogged=false,west=false]",
+    ]
+    # the cache keys
+    cache = {Block.from_string_blockstate(state): state for state in states}
+    # equal blocks that are different objects, as when a palette is read again
+    blocks = [Block.from_string_blockstate(state) for state in states]
+    for block in blocks:
+        hash(block)
+
+    def lookup(blocks_: list[Block]) -> None:
+        for _ in range(Lookups // len(blocks_)):
+            for block in blocks_:
+                cache[block]
+
+    for name, blocks_ in (("same objects", list(cache)), ("equal objects", blocks)):
+        best = min(timeit.repeat(lambda: lookup(blocks_), number=1, repeat=Repeats))
+        print(
+            f"cache lookup ({name}): {best / Lookups * 1_000_000_000:.0f}ns per lookup"
+        )
+
+    best = min(
+        timeit.repeat(
+            lambda: [hash(Block.from_string_blockstate(state)) for state in states],
+            number=Lookups // len(states),
+            repeat=Repeats,
+        )
+    )
+    print(f"parse and hash: {best / Lookups * 1_000_000_000:.0f}ns per block")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import timeit
+
+from minecraft_model_reader.api.resource_pack.java.download_resources import (
+    get_java_vanilla_fix,
+)
+from minecraft_model_reader.api.resource_pack import load_resource_pack_manager
+from minecraft_model_reader.api import Block
+
+Repeats = 5
+Lookups = 10_000
+
+
+def main():
+    rp = load_resource_pack_manager([get_java_vanilla_fix()])
+    blocks = [
+        Block("minecraft", "chest"),
+        Block("minecraft", "black_bed"),
+        Block("minecraft", "acacia_sign"),
+        Block("minecraft", "black_banner"),
+    ]
+    # populate the cache so that only cache hits are timed
+    for block in blocks:
+        rp.get_block_model(block)
+
+    def lookup(copy: bool) -> None:
+        for _ in range(Lookups // len(blocks)):
+            for block in blocks:
+                rp.get_block_model(block, copy)
+
+    for copy in (True, False):
+        best = min(timeit.repeat(lambda: lookup(copy), number=1, repeat=Repeats))
+        print(
+            f"get_block_model(copy={copy}): {best / Lookups * 1_000_000:.2f}µs per lookup"
+        )
+
+
+if __name__ == "__main__":
+    main()
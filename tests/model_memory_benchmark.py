@@ -0,0 +1,56 @@
+import json
+import os
+import amulet_nbt
+
+from minecraft_model_reader.api.resource_pack.bedrock.download_resources import (
+    get_bedrock_vanilla_latest,
+    get_bedrock_vanilla_fix,
+)
+from minecraft_model_reader.api.resource_pack.bedrock import (
+    BedrockResourcePackManager,
+)
+from minecraft_model_reader.api import Block
+
+NBTMap = {
+    "byte": amulet_nbt.TAG_Byte,
+    "int": amulet_nbt.TAG_Int,
+    "string": amulet_nbt.TAG_String,
+}
+
+
+def main():
+    packs = [get_bedrock_vanilla_latest(), get_bedrock_vanilla_fix()]
+    with open(
+        os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "minecraft_model_reader",
+            "api",
+            "resource_pack",
+            "bedrock",
+            "block_palette.json",
+        )
+    ) as f:
+        palette = json.load(f)
+    blocks = [
+        Block(
+            *state["name"].split(":", 1),
+            {
+                prop["name"]: NBTMap[prop["type"]](prop["value"])
+                for prop in state["states"]
+            },
+        )
+        for state in palette["blocks"]
+    ]
+
+    for compact_models in (False, True):
+        rp = BedrockResourcePackManager(packs, compact_models=compact_models)
+        rp.get_block_models(blocks)
+        info = rp.model_cache_info
+        print(
+            f"compact_models={compact_models}: {info.entries} block states sharing {info.unique_entries} models using {info.nbytes / 1_000_000:.2f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from minecraft_model_reader.api.archive import (
+    close_archive,
+    get_zip_index,
+    in_archive,
+    is_archive,
+    iter_archive_files,
+    open_resource,
+    resource_isfile,
+    resource_mtime,
+)
+
+
+class ArchiveTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self._temp_dir, "pack.zip")
+        with zipfile.ZipFile(self.zip_path, "w") as zip_file:
+            zip_file.writestr("pack/pack.mcmeta", "{}")
+            zip_file.writestr("pack/assets/minecraft/a.txt", "a")
+            zip_file.writestr("pack/assets/minecraft/b/c.bin", b"\x00\x01")
+        self.dir_path = os.path.join(self._temp_dir, "dir")
+        os.makedirs(self.dir_path)
+        with open(os.path.join(self.dir_path, "a.txt"), "w") as f:
+            f.write("dir")
+
+    def tearDown(self) -> None:
+        close_archive(self.zip_path)
+        shutil.rmtree(self._temp_dir)
+
+    def test_is_archive(self) -> None:
+        self.assertTrue(is_archive(self.zip_path))
+        self.assertFalse(is_archive(self.dir_path))
+        self.assertTrue(in_archive(self.zip_path))
+        self.assertTrue(in_archive(os.path.join(self.zip_path, "pack")))
+        self.assertFalse(in_archive(self.dir_path))
+        self.assertFalse(in_archive(os.path.join(self.dir_path, "missing.txt")))
+
+    def test_find_root(self) -> None:
+        index = get_zip_index(self.zip_path)
+        self.assertEqual(index.find_root("pack.mcmeta"), "pack/")
+        self.assertIsNone(index.find_root("manifest.json"))
+
+    def test_close_archive(self) -> None:
+        index = get_zip_index(self.zip_path)
+        self.assertIs(get_zip_index(self.zip_path), index)
+        close_archive(self.zip_path)
+        self.assertIsNot(get_zip_index(self.zip_path), index)
+        # closing an archive without an index does nothing
+        close_archive(self.zip_path)
+        close_archive(self.dir_path)
+
+    def test_read(self) -> None:
+        pack_path = os.path.join(self.zip_path, "pack")
+        a_path = os.path.join(pack_path, "assets", "minecraft", "a.txt")
+        c_path = os.path.join(pack_path, "assets", "minecraft", "b", "c.bin")
+        self.assertTrue(resource_isfile(a_path))
+        self.assertFalse(resource_isfile(os.path.join(pack_path, "assets")))
+        self.assertFalse(resource_isfile(os.path.join(pack_path, "missing.txt")))
+        with open_resource(a_path, "r") as f:
+            self.assertEqual(f.read(), "a")
+        with open_resource(c_path) as f:
+            self.assertEqual(f.read(), b"\x00\x01")
+        with self.assertRaises(FileNotFoundError):
+            open_resource(os.path.join(pack_path, "missing.txt"))
+        self.assertEqual(resource_mtime(a_path), os.stat(self.zip_path).st_mtime)
+        self.assertEqual(
+            sorted(iter_archive_files(os.path.join(pack_path, "assets"))),
+            sorted([a_path, c_path]),
+        )
+
+    def test_read_directory(self) -> None:
+        a_path = os.path.join(self.dir_path, "a.txt")
+        self.assertTrue(resource_isfile(a_path))
+        self.assertFalse(resource_isfile(os.path.join(self.dir_path, "missing.txt")))
+        with open_resource(a_path, "r") as f:
+            self.assertEqual(f.read(), "dir")
+        with self.assertRaises(FileNotFoundError):
+            open_resource(os.path.join(self.dir_path, "missing.txt"))
+        with self.assertRaises(FileNotFoundError):
+            resource_mtime(os.path.join(self.dir_path, "missing.txt"))
+        self.assertEqual(list(iter_archive_files(self.dir_path)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+
+from minecraft_model_reader.api import Block
+from minecraft_model_reader.api.amulet.block import BlockRegistry
+
+# Pickle a hashed block in a process with a different str hash seed.
+PickleScript = """
+import pickle, sys
+from minecraft_model_reader.api import Block
+from minecraft_model_reader.api.amulet.block import BlockRegistry
+block = Block.from_string_blockstate("minecraft:oak_log[axis=x]")
+hash(block)
+sys.stdout.buffer.write(pickle.dumps(block))
+"""
+
+
+class BlockTestCase(unittest.TestCase):
+    def test_hash(self) -> None:
+        block_1 = Block.from_string_blockstate("minecraft:oak_log[axis=x]")
+        block_2 = Block.from_string_blockstate("minecraft:oak_log[axis=x]")
+        self.assertEqual(block_1, block_2)
+        self.assertEqual(hash(block_1), hash(block_2))
+        self.assertNotEqual(
+            block_1, Block.from_string_blockstate("minecraft:oak_log[axis=y]")
+        )
+        self.assertNotEqual(block_1, block_1 + block_2)
+        self.assertEqual(block_1 + block_2, block_2 + block_1)
+
+    def test_pickle(self) -> None:
+        block = Block.from_string_blockstate("minecraft:oak_log[axis=x]")
+        hash(block)
+        block_copy = pickle.loads(pickle.dumps(block))
+        self.assertEqual(block, block_copy)
+        self.assertEqual(hash(block), hash(block_copy))
+
+    def test_pickle_between_processes(self) -> None:
+        env = dict(os.environ)
+        env["PYTHONHASHSEED"] = "1" if os.environ.get("PYTHONHASHSEED") != "1" else "2"
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        pickled = subprocess.run(
+            [sys.executable, "-c", PickleScript],
+            env=env,
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        block = pickle.loads(pickled)
+        block_2 = Block.from_string_blockstate("minecraft:oak_log[axis=x]")
+        hash(block)
+        hash(block_2)
+        self.assertEqual(block, block_2)
+        self.assertIn(block, {block_2: 1})
+
+    def test_registry(self) -> None:
+        registry = BlockRegistry()
+        block = registry.from_string_blockstate("minecraft:oak_log[axis=x]")
+        self.assertIs(
+            registry.intern(Block.from_string_blockstate("minecraft:oak_log[axis=x]")),
+            block,
+        )
+        self.assertIs(
+            registry.from_string_blockstate("minecraft:oak_log[axis=x]"), block
+        )
+        self.assertIs(
+            registry.from_snbt_blockstate('minecraft:oak_log[axis="x"]'), block
+        )
+        self.assertIsNot(
+            registry.from_string_blockstate("minecraft:oak_log[axis=y]"), block
+        )
+
+    def test_registry_other_class(self) -> None:
+        # A class with the public api of Block but not its private attributes. Eg. the amulet-core Block.
+        class OtherBlock:
+            def __init__(self, block: Block):
+                self.namespaced_name = block.namespaced_name
+                self.properties = block.properties
+                self.extra_blocks = block.extra_blocks
+
+            @classmethod
+            def from_string_blockstate(cls, blockstate: str) -> "OtherBlock":
+                return cls(Block.from_string_blockstate(blockstate))
+
+        registry = BlockRegistry(block_class=OtherBlock)
+        block = registry.from_string_blockstate("minecraft:oak_log[axis=x]")
+        self.assertIsInstance(block, OtherBlock)
+        self.assertIs(
+            registry.intern(
+                OtherBlock(Block.from_string_blockstate("minecraft:oak_log[axis=x]"))
+            ),
+            block,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
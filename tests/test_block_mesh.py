@@ -0,0 +1,138 @@
+import copy
+import pickle
+import unittest
+
+import numpy
+
+from minecraft_model_reader.api.mesh.block.block_mesh import (
+    BlockMesh,
+    Transparency,
+    FACE_KEY_ORDER,
+    PackedVertexWidth,
+)
+from minecraft_model_reader.api.mesh.block.cube import get_cube, get_unit_cube
+
+
+def get_test_mesh() -> BlockMesh:
+    """A mesh with faces in every cull direction and faces that are never culled."""
+    return BlockMesh.merge(
+        [
+            get_unit_cube("down", "up", "north", "east", "south", "west"),
+            get_cube(
+                "a",
+                "b",
+                "c",
+                "a",
+                "b",
+                "c",
+                Transparency.Partial,
+                (0, 1, 0),
+                ((0.25, 0.75), (0, 0.5), (0.25, 0.75)),
+                do_not_cull=(False, True, True, False, False, True),
+            ),
+        ]
+    )
+
+
+class BlockMeshTestCase(unittest.TestCase):
+    def assertMeshEqual(self, mesh_1: BlockMesh, mesh_2: BlockMesh) -> None:
+        self.assertEqual(mesh_1.face_mode, mesh_2.face_mode)
+        self.assertEqual(mesh_1.textures, mesh_2.textures)
+        self.assertEqual(mesh_1.is_transparent, mesh_2.is_transparent)
+        for table in (
+            "verts",
+            "texture_coords",
+            "tint_verts",
+            "faces",
+            "texture_index",
+        ):
+            table_1 = getattr(mesh_1, table)
+            table_2 = getattr(mesh_2, table)
+            self.assertEqual(table_1.keys(), table_2.keys(), table)
+            for key in table_1:
+                self.assertEqual(table_1[key].dtype, table_2[key].dtype, table)
+                numpy.testing.assert_array_equal(table_1[key], table_2[key], table)
+
+    def test_bytes_round_trip(self) -> None:
+        for mesh in (
+            BlockMesh.merge([]),
+            get_unit_cube("a", "a", "a", "a", "a", "a"),
+            get_test_mesh(),
+            get_test_mesh().compact(),
+        ):
+            with self.subTest(faces=list(mesh.faces)):
+                mesh_2 = BlockMesh.from_bytes(mesh.to_bytes())
+                self.assertMeshEqual(mesh, mesh_2)
+                self.assertEqual(mesh, mesh_2)
+                self.assertEqual(mesh.to_bytes(), mesh_2.to_bytes())
+                self.assertMeshEqual(mesh, pickle.loads(pickle.dumps(mesh)))
+
+    def test_bytes_invalid(self) -> None:
+        data = get_test_mesh().to_bytes()
+        with self.assertRaises(ValueError):
+            BlockMesh.from_bytes(b"XXXX" + data[4:])
+        with self.assertRaises(ValueError):
+            BlockMesh.from_bytes(data[:4] + b"\xff" + data[5:])
+
+    def test_read_only(self) -> None:
+        mesh = get_test_mesh()
+        with self.assertRaises(ValueError):
+            mesh.verts["up"][0] = 1
+
+    def test_copy(self) -> None:
+        mesh = BlockMesh.from_bytes(get_test_mesh().to_bytes())
+        for mesh_copy in (mesh.copy(), copy.deepcopy(mesh)):
+            self.assertMeshEqual(mesh, mesh_copy)
+            mesh_copy.verts["up"][0] = 5
+            mesh_copy.texture_coords[None][0] = 5
+            mesh_copy.tint_verts["north"][0] = 0
+            mesh_copy.faces["west"][0] = 0
+            mesh_copy.texture_index["down"][0] = 0
+            self.assertEqual(mesh_copy.verts["up"][0], 5)
+            self.assertNotEqual(mesh.verts["up"][0], 5)
+
+    def test_packed(self) -> None:
+        mesh = get_test_mesh()
+        packed = mesh.packed
+        self.assertEqual(packed.vert_offsets.dtype, numpy.uint32)
+        self.assertEqual(packed.face_offsets.dtype, numpy.uint32)
+        self.assertEqual(packed.faces.dtype, numpy.uint32)
+        self.assertEqual(packed.texture_index.dtype, numpy.uint32)
+        vertices = packed.vertices.reshape(-1, PackedVertexWidth)
+        for index, key in enumerate(FACE_KEY_ORDER):
+            vert_start, vert_stop = packed.vert_offsets[index].tolist()
+            face_start, face_stop = packed.face_offsets[index].tolist()
+            if key not in mesh.faces:
+                self.assertEqual(vert_start, vert_stop)
+                self.assertEqual(face_start, face_stop)
+                continue
+            numpy.testing.assert_array_equal(
+                vertices[vert_start:vert_stop, 0:3].ravel(), mesh.verts[key]
+            )
+            numpy.testing.assert_array_equal(
+                vertices[vert_start:vert_stop, 3:5].ravel(), mesh.texture_coords[key]
+            )
+            numpy.testing.assert_array_equal(
+                packed.faces[face_start * mesh.face_mode : face_stop * mesh.face_mode]
+                - vert_start,
+                mesh.faces[key],
+            )
+            numpy.testing.assert_array_equal(
+                packed.texture_index[face_start:face_stop], mesh.texture_index[key]
+            )
+
+    def test_compact(self) -> None:
+        mesh = get_test_mesh()
+        compact = mesh.compact()
+        self.assertEqual(compact.verts["up"].dtype, numpy.float32)
+        self.assertEqual(compact.tint_verts["up"].dtype, numpy.uint8)
+        self.assertEqual(compact.faces["up"].dtype, numpy.uint16)
+        self.assertLess(compact.nbytes, mesh.nbytes)
+        for key in mesh.faces:
+            numpy.testing.assert_array_equal(mesh.faces[key], compact.faces[key])
+            numpy.testing.assert_allclose(mesh.verts[key], compact.verts[key])
+        self.assertIs(compact.compact(), compact)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import itertools
+import unittest
+from typing import Any
+
+from minecraft_model_reader.api import Block
+from minecraft_model_reader.api.resource_pack.java.blockstate import (
+    VariantMatcher,
+    MultipartMatcher,
+)
+
+Variants = {
+    "facing=north,lit=false": "a",
+    "lit=false,facing=east": "b",
+    "facing=south,lit=true": "c",
+    "facing=west": "d",
+    "lit=true": "e",
+    "facing=north,lit=false,extra=1": "f",
+    "": "g",
+}
+
+Multipart = [
+    {"apply": {"model": "post"}},
+    {"when": {"north": "true"}, "apply": {"model": "north"}},
+    {"when": {"east": True}, "apply": {"model": "east"}},
+    {"when": {"south": "low|tall"}, "apply": {"model": "south"}},
+    {"when": {"north": False, "east": "false"}, "apply": {"model": "none"}},
+    {
+        "when": {"OR": [{"north": "true"}, {"east": "true", "south": "low"}]},
+        "apply": {"model": "or"},
+    },
+    {
+        "when": {"AND": [{"north": "true"}, {"east": "false|true"}]},
+        "apply": {"model": "and"},
+    },
+    {"when": {"north": "true"}},
+    {"when": {"north": 1}, "apply": {"model": "invalid"}},
+]
+
+
+def find_variants(variants: dict[str, Any], properties: dict[str, Any]) -> list[Any]:
+    """The variants that matched before the variants were compiled. A property the block does not have matches any value."""
+    matches = []
+    for variant, value in variants.items():
+        if all(
+            properties.get(match.group("name"), match.group("value"))
+            == match.group("value")
+            for match in Block.properties_regex.finditer(f",{variant}")
+        ):
+            matches.append(value)
+    return matches
+
+
+def find_cases(multipart: list[Any], properties: dict[str, Any]) -> list[Any]:
+    """The apply values of the cases that matched before the multipart was compiled."""
+
+    def values(val: Any) -> set[str]:
+        if isinstance(val, str):
+            return set(val.split("|"))
+        elif isinstance(val, bool):
+            return {"true" if val else "false"}
+        raise Exception
+
+    def matches(conditions: dict[str, Any]) -> bool:
+        return all(
+            properties.get(name) in values(val) for name, val in conditions.items()
+        )
+
+    applied = []
+    for case in multipart:
+        try:
+            when = case.get("when")
+            if when is not None:
+                if "OR" in when:
+                    if not any(matches(conditions) for conditions in when["OR"]):
+                        continue
+                elif "AND" in when:
+                    if not all(matches(conditions) for conditions in when["AND"]):
+                        continue
+                elif not matches(when):
+                    continue
+            if "apply" in case:
+                applied.append(case["apply"])
+        except Exception:
+            pass
+    return applied
+
+
+def iter_properties(values: dict[str, tuple[Any, ...]]) -> Any:
+    """Every combination of the given property values. None means the block does not have the property."""
+    names = list(values)
+    for combination in itertools.product(*values.values()):
+        yield {
+            name: value for name, value in zip(names, combination) if value is not None
+        }
+
+
+class VariantMatcherTestCase(unittest.TestCase):
+    def test_find(self) -> None:
+        matcher = VariantMatcher(Variants)
+        self.assertEqual(
+            matcher.find({"facing": "north", "lit": "false"}), ["a", "f", "g"]
+        )
+        self.assertEqual(
+            matcher.find({"facing": "west", "lit": "true"}), ["d", "e", "g"]
+        )
+        # properties the block does not have match any value
+        self.assertEqual(matcher.find({"facing": "north"}), ["a", "e", "f", "g"])
+        self.assertEqual(matcher.find({}), list(Variants.values()))
+
+    def test_matches_uncompiled(self) -> None:
+        matcher = VariantMatcher(Variants)
+        for properties in iter_properties(
+            {
+                "facing": ("north", "east", "south", "west", "up", None),
+                "lit": ("true", "false", None),
+                "extra": ("1", "2", 1, None),
+            }
+        ):
+            with self.subTest(properties=properties):
+                self.assertEqual(
+                    matcher.find(properties), find_variants(Variants, properties)
+                )
+
+    def test_empty(self) -> None:
+        self.assertEqual(VariantMatcher({}).find({"facing": "north"}), [])
+        self.assertEqual(VariantMatcher({"": 1}).find({"facing": "north"}), [1])
+
+
+class MultipartMatcherTestCase(unittest.TestCase):
+    def test_find(self) -> None:
+        with self.assertLogs(level="ERROR"):
+            matcher = MultipartMatcher(Multipart)
+        self.assertEqual(
+            [case.apply["model"] for case in matcher.find({})],
+            ["post"],
+        )
+        self.assertEqual(
+            [
+                case.apply["model"]
+                for case in matcher.find(
+                    {"north": "true", "east": "false", "south": "low"}
+                )
+            ],
+            ["post", "north", "south", "or", "and"],
+        )
+
+    def test_matches_uncompiled(self) -> None:
+        with self.assertLogs(level="ERROR"):
+            matcher = MultipartMatcher(Multipart)
+        for properties in iter_properties(
+            {
+                "north": ("true", "false", None),
+                "east": ("true", "false", None),
+                "south": ("low", "tall", "none", None),
+            }
+        ):
+            with self.subTest(properties=properties):
+                self.assertEqual(
+                    [case.apply for case in matcher.find(properties)],
+                    find_cases(Multipart, properties),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
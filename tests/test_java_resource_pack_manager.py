@@ -0,0 +1,461 @@
+import copy
+import gc
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import weakref
+import zipfile
+from typing import Any
+
+import numpy
+from PIL import Image
+
+from minecraft_model_reader.api import Block
+from minecraft_model_reader.api.archive import close_archive
+from minecraft_model_reader.api.resource_pack.java import (
+    JavaResourcePack,
+    JavaResourcePackManager,
+)
+
+
+def _write_json(path: str, data: Any) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def create_pack(path: str) -> None:
+    """Write a small Java resource pack to a directory."""
+    _write_json(
+        os.path.join(path, "pack.mcmeta"),
+        {"pack": {"pack_format": 15, "description": "test"}},
+    )
+    assets = os.path.join(path, "assets", "minecraft")
+    os.makedirs(os.path.join(assets, "textures", "block"))
+    for name, alpha in (("stone", 255), ("glass", 0)):
+        image = numpy.full((16, 16, 4), 200, numpy.uint8)
+        image[..., 3] = alpha
+        Image.fromarray(image, "RGBA").save(
+            os.path.join(assets, "textures", "block", f"{name}.png")
+        )
+    models = os.path.join(assets, "models", "block")
+    _write_json(
+        os.path.join(models, "cube_all.json"),
+        {
+            "textures": {"particle": "#all"},
+            "elements": [
+                {
+                    "from": [0, 0, 0],
+                    "to": [16, 16, 16],
+                    "faces": {
+                        face: {"texture": "#all", "cullface": face}
+                        for face in ("down", "up", "north", "east", "south", "west")
+                    },
+                }
+            ],
+        },
+    )
+    _write_json(
+        os.path.join(models, "post.json"),
+        {
+            "textures": {"all": "block/stone"},
+            "elements": [
+                {
+                    "from": [6, 0, 6],
+                    "to": [10, 16, 10],
+                    "faces": {
+                        face: {"texture": "#all"}
+                        for face in ("down", "up", "north", "east", "south", "west")
+                    },
+                }
+            ],
+        },
+    )
+    for name in ("stone", "glass"):
+        _write_json(
+            os.path.join(models, f"{name}.json"),
+            {"parent": "block/cube_all", "textures": {"all": f"block/{name}"}},
+        )
+    blockstates = os.path.join(assets, "blockstates")
+    _write_json(
+        os.path.join(blockstates, "stone.json"),
+        {"variants": {"": {"model": "block/stone"}}},
+    )
+    _write_json(
+        os.path.join(blockstates, "glass.json"),
+        {"variants": {"": {"model": "block/glass"}}},
+    )
+    _write_json(
+        os.path.join(blockstates, "log.json"),
+        {
+            "variants": {
+                "axis=y": {"model": "block/post"},
+                "axis=x": {"model": "block/post", "x": 90, "y": 90},
+                "axis=z": {"model": "block/post", "x": 90},
+            }
+        },
+    )
+
+
+class JavaResourcePackManagerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.mkdtemp()
+        self._cache_dir = os.environ.get("CACHE_DIR")
+        os.environ["CACHE_DIR"] = os.path.join(self._temp_dir, "cache")
+        self.pack_path = os.path.join(self._temp_dir, "pack")
+        create_pack(self.pack_path)
+
+    def tearDown(self) -> None:
+        if self._cache_dir is None:
+            del os.environ["CACHE_DIR"]
+        else:
+            os.environ["CACHE_DIR"] = self._cache_dir
+        shutil.rmtree(self._temp_dir)
+
+    def test_load(self) -> None:
+        manager = JavaResourcePackManager([JavaResourcePack(self.pack_path)])
+        stone = manager.get_block_model(Block("minecraft", "stone"))
+        self.assertEqual(
+            stone.textures,
+            (
+                os.path.join(
+                    self.pack_path,
+                    "assets",
+                    "minecraft",
+                    "textures",
+                    "block",
+                    "stone.png",
+                ),
+            ),
+        )
+        self.assertEqual(
+            set(stone.faces), {"down", "up", "north", "east", "south", "west"}
+        )
+        self.assertIs(manager.get_block_model(Block("minecraft", "stone")), stone)
+        self.assertIs(
+            manager.get_block_model(Block("minecraft", "unknown")),
+            manager.missing_block,
+        )
+
+    def test_texture_workers(self) -> None:
+        pack_path_2 = os.path.join(self._temp_dir, "pack_2")
+        shutil.copytree(self.pack_path, pack_path_2)
+        transparency = []
+        for texture_workers in (0, 2):
+            shutil.rmtree(os.environ["CACHE_DIR"], ignore_errors=True)
+            manager = JavaResourcePackManager(
+                [JavaResourcePack(self.pack_path), JavaResourcePack(pack_path_2)],
+                texture_workers=texture_workers,
+            )
+            transparency.append(
+                {
+                    texture: manager.get_texture_transparency(texture)
+                    for texture in manager.textures
+                    if texture != manager.missing_no
+                }
+            )
+        self.assertEqual(transparency[0], transparency[1])
+        # the textures in the second pack replace those in the first
+        self.assertEqual(len(transparency[0]), 2)
+        self.assertTrue(all(path.startswith(pack_path_2) for path in transparency[0]))
+
+    def test_copy(self) -> None:
+        manager = JavaResourcePackManager([JavaResourcePack(self.pack_path)])
+        block = Block.from_string_blockstate("minecraft:log[axis=x]")
+        model = manager.get_block_model(block)
+        with self.assertRaises(ValueError):
+            model.verts[None][0] = 5
+        for model_copy in (
+            manager.get_block_model(block, copy=True),
+            manager.get_block_models([block], copy=True)[0],
+            manager.get_block_model_by_id(manager.register_palette([block])[0], True),
+        ):
+            self.assertIsNot(model_copy, model)
+            model_copy.verts[None][0] = 5
+            model_copy.faces[None][0] = 0
+            self.assertEqual(model_copy.verts[None][0], 5)
+            self.assertNotEqual(model.verts[None][0], 5)
+        self.assertIs(manager.get_block_model(block), model)
+
+    def test_block_id_cache_limit(self) -> None:
+        manager = JavaResourcePackManager(
+            [JavaResourcePack(self.pack_path)], max_cached_models=1
+        )
+        stone_id, glass_id = manager.register_palette(
+            [Block("minecraft", "stone"), Block("minecraft", "glass")]
+        ).tolist()
+        stone = manager.get_block_model_by_id(stone_id)
+        self.assertIs(manager.get_block_model_by_id(stone_id), stone)
+        info = manager.model_cache_info
+        self.assertEqual((info.hits, info.misses, info.entries), (1, 1, 1))
+
+        stone_ref = weakref.ref(stone)
+        del stone
+        manager.get_block_model_by_id(glass_id)
+        info = manager.model_cache_info
+        self.assertEqual((info.evictions, info.entries), (1, 1))
+        # The evicted model is not kept alive by the block id table
+        manager._blockstate_models.clear()
+        gc.collect()
+        self.assertIsNone(stone_ref())
+
+        manager.get_block_model_by_id(stone_id)
+        info = manager.model_cache_info
+        self.assertEqual((info.hits, info.misses, info.evictions), (1, 3, 2))
+
+    def test_compact_models(self) -> None:
+        manager = JavaResourcePackManager([JavaResourcePack(self.pack_path)])
+        compact_manager = JavaResourcePackManager(
+            [JavaResourcePack(self.pack_path)], compact_models=True
+        )
+        for blockstate in ("minecraft:stone", "minecraft:log[axis=x]"):
+            block = Block.from_string_blockstate(blockstate)
+            model = manager.get_block_model(block)
+            compact = compact_manager.get_block_model(block)
+            for key in model.faces:
+                self.assertEqual(compact.verts[key].dtype, numpy.float32)
+                numpy.testing.assert_allclose(compact.verts[key], model.verts[key])
+        # the models used to build the block models are compact so they are not stored twice
+        self.assertTrue(compact_manager._blockstate_models)
+        for model in compact_manager._blockstate_models.values():
+            self.assertIs(model.compact(), model)
+        self.assertIs(
+            compact_manager.get_block_model(Block("minecraft", "stone")),
+            compact_manager._blockstate_models[("block/stone", 0, 0, False)],
+        )
+
+    def test_persistent_cache(self) -> None:
+        blocks = [
+            Block("minecraft", "stone"),
+            Block("minecraft", "glass"),
+            Block.from_string_blockstate("minecraft:log[axis=x]"),
+        ]
+        manager = JavaResourcePackManager(
+            [JavaResourcePack(self.pack_path)],
+            persistent_cache=True,
+            max_cached_models=2,
+        )
+        models = manager.get_block_models(blocks)
+        manager.save_model_cache()
+        cached_blocks = {
+            block.snbt_blockstate for block, _ in manager._cached_models.items()
+        }
+        self.assertEqual(len(cached_blocks), 2)
+
+        manager_2 = JavaResourcePackManager(
+            [JavaResourcePack(self.pack_path)], persistent_cache=True
+        )
+        # Only the models in the model cache are saved
+        self.assertEqual(set(manager_2._persistent_models), cached_blocks)
+        for block, model in zip(blocks, models):
+            self.assertEqual(manager_2.get_block_model(block), model)
+        self.assertFalse(manager_2._persistent_models)
+
+    def test_resolve_models(self) -> None:
+        manager = JavaResourcePackManager([JavaResourcePack(self.pack_path)])
+        resolve_manager = JavaResourcePackManager(
+            [JavaResourcePack(self.pack_path)], resolve_models=True
+        )
+        # every model file is resolved when loading
+        self.assertEqual(
+            set(resolve_manager._resolved_models), set(resolve_manager._model_files)
+        )
+        cube_all = copy.deepcopy(
+            resolve_manager._resolved_models[("minecraft", "block/cube_all")]
+        )
+        self.assertEqual(cube_all["textures"], {"particle": "#all"})
+        for blockstate in (
+            "minecraft:stone",
+            "minecraft:glass",
+            "minecraft:log[axis=x]",
+            "minecraft:unknown",
+        ):
+            block = Block.from_string_blockstate(blockstate)
+            self.assertEqual(
+                resolve_manager.get_block_model(block), manager.get_block_model(block)
+            )
+        # the children that set textures do not modify the cached parent
+        self.assertEqual(
+            resolve_manager._resolved_models[("minecraft", "block/cube_all")],
+            cube_all,
+        )
+        self.assertEqual(
+            resolve_manager._resolved_models[("minecraft", "block/stone")]["textures"],
+            {"particle": "#all", "all": "block/stone"},
+        )
+
+    def test_lazy_load(self) -> None:
+        manager = JavaResourcePackManager([JavaResourcePack(self.pack_path)])
+        lazy_manager = JavaResourcePackManager(
+            [JavaResourcePack(self.pack_path)], lazy_load=True
+        )
+        # the files are found but not parsed
+        self.assertFalse(lazy_manager._blockstate_files)
+        self.assertFalse(lazy_manager._model_files)
+        self.assertEqual(len(lazy_manager._blockstate_file_paths), 3)
+        self.assertEqual(len(lazy_manager._model_file_paths), 4)
+
+        stone = Block("minecraft", "stone")
+        self.assertEqual(
+            lazy_manager.get_block_model(stone), manager.get_block_model(stone)
+        )
+        # only the blockstate and the model files it uses are parsed
+        self.assertEqual(set(lazy_manager._blockstate_files), {("minecraft", "stone")})
+        self.assertEqual(
+            set(lazy_manager._model_files),
+            {("minecraft", "block/stone"), ("minecraft", "block/cube_all")},
+        )
+
+        for blockstate in (
+            "minecraft:glass",
+            "minecraft:log[axis=x]",
+            "minecraft:log[axis=z]",
+            "minecraft:unknown",
+        ):
+            block = Block.from_string_blockstate(blockstate)
+            self.assertEqual(
+                lazy_manager.get_block_model(block), manager.get_block_model(block)
+            )
+        self.assertFalse(lazy_manager._blockstate_file_paths)
+        self.assertFalse(lazy_manager._model_file_paths)
+
+    def test_lazy_load_persistent_cache(self) -> None:
+        manager = JavaResourcePackManager([JavaResourcePack(self.pack_path)])
+        lazy_manager = JavaResourcePackManager(
+            [JavaResourcePack(self.pack_path)], lazy_load=True, persistent_cache=True
+        )
+        stone = Block("minecraft", "stone")
+        lazy_manager.get_block_model(stone)
+        # only the files parsed so far are saved
+        lazy_manager.save_model_cache()
+
+        lazy_manager_2 = JavaResourcePackManager(
+            [JavaResourcePack(self.pack_path)], lazy_load=True, persistent_cache=True
+        )
+        self.assertEqual(
+            set(lazy_manager_2._blockstate_files), {("minecraft", "stone")}
+        )
+        self.assertEqual(
+            set(lazy_manager_2._model_files),
+            {("minecraft", "block/stone"), ("minecraft", "block/cube_all")},
+        )
+        self.assertEqual(
+            set(lazy_manager_2._persistent_models), {stone.snbt_blockstate}
+        )
+        # the files not in the cache are parsed when needed
+        self.assertNotIn(("minecraft", "stone"), lazy_manager_2._blockstate_file_paths)
+        self.assertIn(("minecraft", "glass"), lazy_manager_2._blockstate_file_paths)
+        for blockstate in (
+            "minecraft:stone",
+            "minecraft:glass",
+            "minecraft:log[axis=x]",
+        ):
+            block = Block.from_string_blockstate(blockstate)
+            self.assertEqual(
+                lazy_manager_2.get_block_model(block), manager.get_block_model(block)
+            )
+        self.assertFalse(lazy_manager_2._blockstate_file_paths)
+        self.assertFalse(lazy_manager_2._model_file_paths)
+
+    def _zip_pack(self) -> str:
+        """Zip the pack into a directory within a zip file."""
+        zip_path = os.path.join(self._temp_dir, "pack.zip")
+        with zipfile.ZipFile(zip_path, "w") as zip_file:
+            for directory, _, file_names in os.walk(self.pack_path):
+                for file_name in file_names:
+                    path = os.path.join(directory, file_name)
+                    zip_file.write(
+                        path,
+                        "nested/"
+                        + os.path.relpath(path, self.pack_path).replace(os.sep, "/"),
+                    )
+        return zip_path
+
+    def test_zip(self) -> None:
+        zip_path = self._zip_pack()
+        pack = JavaResourcePack(zip_path)
+        self.assertTrue(pack.valid_pack)
+        self.assertTrue(pack.in_archive)
+        self.assertEqual(pack.root_dir, os.path.join(zip_path, "nested"))
+        self.assertFalse(JavaResourcePack(self.pack_path).in_archive)
+
+        manager = JavaResourcePackManager([JavaResourcePack(self.pack_path)])
+        zip_manager = JavaResourcePackManager([pack])
+        self.assertEqual(
+            sorted(
+                os.path.relpath(path, self.pack_path)
+                for path in manager.textures
+                if path.startswith(self.pack_path)
+            ),
+            sorted(
+                os.path.relpath(path, pack.root_dir)
+                for path in zip_manager.textures
+                if path.startswith(pack.root_dir)
+            ),
+        )
+        for blockstate in (
+            "minecraft:stone",
+            "minecraft:glass",
+            "minecraft:log[axis=x]",
+        ):
+            block = Block.from_string_blockstate(blockstate)
+            model = manager.get_block_model(block)
+            zip_model = zip_manager.get_block_model(block)
+            self.assertEqual(
+                zip_model.textures[0],
+                os.path.join(
+                    pack.root_dir, os.path.relpath(model.textures[0], self.pack_path)
+                ),
+            )
+            self.assertEqual(zip_model.is_transparent, model.is_transparent)
+            for key in model.faces:
+                numpy.testing.assert_array_equal(zip_model.verts[key], model.verts[key])
+                numpy.testing.assert_array_equal(zip_model.faces[key], model.faces[key])
+            for texture in zip_model.textures:
+                self.assertEqual(
+                    zip_manager.get_texture_transparency(texture),
+                    manager.get_texture_transparency(
+                        os.path.join(
+                            self.pack_path, os.path.relpath(texture, pack.root_dir)
+                        )
+                    ),
+                )
+        for texture in zip_manager.textures:
+            with zip_manager.open_texture(texture) as f, Image.open(f) as image:
+                self.assertEqual(image.size, (16, 16))
+        close_archive(zip_path)
+
+    def test_zip_process_workers(self) -> None:
+        # enough textures that the worker processes read the zip file at the same time
+        textures = os.path.join(
+            self.pack_path, "assets", "minecraft", "textures", "block"
+        )
+        for i in range(300):
+            image = numpy.full((16, 16, 4), 200, numpy.uint8)
+            image[..., 3] = (i % 3) * 127
+            Image.fromarray(image, "RGBA").save(os.path.join(textures, f"t{i}.png"))
+        zip_path = self._zip_pack()
+        transparency = []
+        for texture_worker_mode in ("thread", "process"):
+            shutil.rmtree(os.environ["CACHE_DIR"], ignore_errors=True)
+            manager = JavaResourcePackManager(
+                [JavaResourcePack(zip_path)],
+                texture_workers=4,
+                texture_worker_mode=texture_worker_mode,
+            )
+            transparency.append(
+                {
+                    texture: manager.get_texture_transparency(texture)
+                    for texture in manager.textures
+                    if texture != manager.missing_no
+                }
+            )
+        self.assertEqual(len(transparency[0]), 302)
+        self.assertEqual(transparency[0], transparency[1])
+        close_archive(zip_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+from minecraft_model_reader.api import Block, BlockMesh
+from minecraft_model_reader.api.mesh.block.cube import get_unit_cube
+from minecraft_model_reader.api.resource_pack.base.model_cache import ModelCache
+
+
+def get_mesh(texture: str) -> BlockMesh:
+    return get_unit_cube(texture, texture, texture, texture, texture, texture)
+
+
+class ModelCacheTestCase(unittest.TestCase):
+    def test_invalid_limits(self) -> None:
+        with self.assertRaises(ValueError):
+            ModelCache(max_entries=0)
+        with self.assertRaises(ValueError):
+            ModelCache(max_bytes=-1)
+
+    def test_get(self) -> None:
+        cache = ModelCache()
+        stone = Block("minecraft", "stone")
+        self.assertIsNone(cache.get(stone))
+        mesh = get_mesh("stone")
+        self.assertIs(cache.put(stone, mesh), mesh)
+        self.assertIs(cache.get(stone), mesh)
+        self.assertIn(stone, cache)
+        info = cache.info
+        self.assertEqual((info.hits, info.misses, info.evictions), (1, 1, 0))
+        self.assertEqual((info.entries, info.unique_entries), (1, 1))
+        self.assertEqual(info.nbytes, mesh.nbytes)
+
+    def test_max_entries(self) -> None:
+        evicted = []
+        cache = ModelCache(
+            max_entries=2, on_evict=lambda block, model: evicted.append(block)
+        )
+        blocks = [Block("minecraft", name) for name in ("a", "b", "c")]
+        cache.put(blocks[0], get_mesh("a"))
+        cache.put(blocks[1], get_mesh("b"))
+        # a is now the most recently used so b is evicted
+        cache.get(blocks[0])
+        cache.put(blocks[2], get_mesh("c"))
+        self.assertEqual(evicted, [blocks[1]])
+        self.assertEqual([block for block, _ in cache.items()], [blocks[0], blocks[2]])
+        info = cache.info
+        self.assertEqual((info.entries, info.evictions, info.max_entries), (2, 1, 2))
+        self.assertEqual(info.nbytes, get_mesh("a").nbytes + get_mesh("c").nbytes)
+
+    def test_max_bytes(self) -> None:
+        mesh_bytes = get_mesh("a").nbytes
+        cache = ModelCache(max_bytes=mesh_bytes * 2)
+        for name in "abcd":
+            cache.put(Block("minecraft", name), get_mesh(name))
+        info = cache.info
+        self.assertEqual((info.entries, info.evictions), (2, 2))
+        self.assertEqual(info.nbytes, mesh_bytes * 2)
+
+        # The model just stored is never evicted even if it is over the limit
+        cache = ModelCache(max_bytes=0)
+        cache.put(Block("minecraft", "a"), get_mesh("a"))
+        cache.put(Block("minecraft", "b"), get_mesh("b"))
+        self.assertEqual([block.base_name for block, _ in cache.items()], ["b"])
+
+    def test_intern(self) -> None:
+        cache = ModelCache()
+        mesh = get_mesh("stone")
+        self.assertIs(cache.put(Block("minecraft", "a"), mesh), mesh)
+        # an equal mesh is replaced by the stored instance
+        self.assertIs(cache.put(Block("minecraft", "b"), get_mesh("stone")), mesh)
+        cache.put(Block("minecraft", "c"), get_mesh("dirt"))
+        info = cache.info
+        self.assertEqual((info.entries, info.unique_entries), (3, 2))
+        self.assertEqual(info.nbytes, mesh.nbytes * 2)
+
+        # replacing and evicting entries releases the shared instance
+        cache.put(Block("minecraft", "a"), get_mesh("dirt"))
+        self.assertEqual(cache.info.unique_entries, 2)
+        cache.put(Block("minecraft", "b"), get_mesh("dirt"))
+        self.assertEqual(cache.info.unique_entries, 1)
+        self.assertEqual(cache.info.nbytes, mesh.nbytes)
+
+    def test_clear(self) -> None:
+        cache = ModelCache()
+        cache.put(Block("minecraft", "a"), get_mesh("a"))
+        cache.get(Block("minecraft", "a"))
+        cache.clear()
+        info = cache.info
+        self.assertEqual((info.entries, info.unique_entries, info.nbytes), (0, 0, 0))
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+from PIL import Image
+
+from minecraft_model_reader.api.image.transparency import (
+    TextureTransparency,
+    get_image_transparency,
+    get_texture_transparency,
+)
+
+
+def rgba_image(*alpha: int) -> Image.Image:
+    """Create a 4x4 RGBA image with the alpha values repeated over the pixels."""
+    data = numpy.full((16, 4), 200, numpy.uint8)
+    data[:, 3] = numpy.resize(numpy.array(alpha, numpy.uint8), 16)
+    return Image.fromarray(data.reshape((4, 4, 4)), "RGBA")
+
+
+class TransparencyTestCase(unittest.TestCase):
+    def test_rgba(self) -> None:
+        for alpha, transparency in (
+            ((255,), TextureTransparency.Opaque),
+            ((0,), TextureTransparency.Cutout),
+            ((0, 255), TextureTransparency.Cutout),
+            ((128, 255), TextureTransparency.Translucent),
+            ((0, 128), TextureTransparency.Translucent),
+            # the extrema are 0 and 255 so the values in between are checked
+            ((0, 128, 255), TextureTransparency.Translucent),
+        ):
+            with self.subTest(alpha=alpha):
+                self.assertEqual(
+                    get_image_transparency(rgba_image(*alpha)), transparency
+                )
+
+    def test_la(self) -> None:
+        for alpha, transparency in (
+            (255, TextureTransparency.Opaque),
+            (0, TextureTransparency.Cutout),
+            (100, TextureTransparency.Translucent),
+        ):
+            with self.subTest(alpha=alpha):
+                image = Image.new("LA", (4, 4), (50, 255))
+                image.putpixel((1, 2), (50, alpha))
+                self.assertEqual(get_image_transparency(image), transparency)
+
+    def test_palette(self) -> None:
+        image = Image.new("P", (4, 4), 0)
+        image.putpalette([0, 0, 0, 255, 255, 255, 100, 100, 100])
+        image.putpixel((0, 0), 1)
+        image.putpixel((1, 1), 2)
+        self.assertEqual(get_image_transparency(image), TextureTransparency.Opaque)
+        # a transparent palette index
+        image.info["transparency"] = 1
+        self.assertEqual(get_image_transparency(image), TextureTransparency.Cutout)
+        # an alpha value for each palette index
+        image.info["transparency"] = bytes([255, 255, 128])
+        self.assertEqual(get_image_transparency(image), TextureTransparency.Translucent)
+
+    def test_rgb(self) -> None:
+        self.assertEqual(
+            get_image_transparency(Image.new("RGB", (4, 4), (10, 20, 30))),
+            TextureTransparency.Opaque,
+        )
+        self.assertEqual(
+            get_image_transparency(Image.new("L", (4, 4), 0)),
+            TextureTransparency.Opaque,
+        )
+
+    def test_texture_file(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "texture.png")
+            rgba_image(0, 255).save(path)
+            self.assertEqual(get_texture_transparency(path), TextureTransparency.Cutout)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()